@@ -14,6 +14,7 @@ if TYPE_CHECKING:
     from clayrs.content_analyzer.memory_interfaces.memory_interfaces import InformationInterface
 
 from clayrs.content_analyzer.content_representation.content import Content, IndexField, ContentEncoder
+from clayrs.content_analyzer.raw_information_source import InMemorySource
 from clayrs.utils.const import logger
 from clayrs.utils.context_managers import get_iterator_thread
 from clayrs.content_analyzer.utils.id_merger import id_merger
@@ -164,10 +165,20 @@ class ContentsProducer:
         if self.__config is None:
             raise Exception("You must set a config with set_config()")
 
+        # the source is iterated once to build the ids of the contents, and then once for each exogenous config and
+        # for each field config. If it is iterated more than once, its rows are read only once and then kept in memory
+        # rather than being read and parsed again for each iteration
+        source = self.__config.source
+        n_field_configs = sum(len(self.__config.get_configs_list(field_name))
+                              for field_name in self.__config.get_field_name_list())
+        n_source_iterations = 1 + len(self.__config.exogenous_representation_list) + n_field_configs
+        if n_source_iterations > 1 and not isinstance(source, InMemorySource):
+            source = InMemorySource(source)
+
         # will store the contents and is the variable that will be returned by the method
         contents_list = []
 
-        for raw_content in self.__config.source:
+        for raw_content in source:
             # construct id from the list of the fields that compound id
             content_id = id_merger(raw_content, self.__config.id)
             contents_list.append(Content(content_id))
@@ -177,7 +188,7 @@ class ContentsProducer:
         # because otherwise it would be necessary to append directly to the content. But in the Content class
         # the representations are kept as dataframes and appending to dataframes is computationally heavy
         for ex_config in self.__config.exogenous_representation_list:
-            lod_properties = ex_config.exogenous_technique.get_properties(self.__config.source)
+            lod_properties = ex_config.exogenous_technique.get_properties(source)
 
             for i in range(len(contents_list)):
                 contents_list[i].append_exogenous_representation(lod_properties[i], ex_config.id)
@@ -198,7 +209,7 @@ class ContentsProducer:
                 # each field repr in the list will refer to a content
                 # technique_result[0] -> contents_list[0]
                 technique_result = field_config.content_technique.produce_content(
-                    field_name, field_config.preprocessing, field_config.postprocessing, self.__config.source)
+                    field_name, field_config.preprocessing, field_config.postprocessing, source)
 
                 if field_config.memory_interface is not None:
                     memory_interface = field_config.memory_interface
@@ -224,7 +235,7 @@ class ContentsProducer:
                     # be added to each content (and it will contain all the necessary information to retrieve the data
                     # from the index)
                     technique_result = [IndexField(index_field_name, i, memory_interface)
-                                        for i in range(len(self.__config.source))]
+                                        for i in range(len(contents_list))]
 
                 for i in range(len(contents_list)):
                     contents_list[i].append_field_representation(field_name, technique_result[i], field_config.id)
@@ -49,11 +49,36 @@ class FeaturesBagField(FieldRepresentation):
     Args:
         sparse_scores: the sparse matrix where features are stored
     """
-    __slots__ = ('__scores', '__pos_feature_tuples')
+    __slots__ = ('__scores', '__pos_feature_tuples', '__sparse_row')
 
     def __init__(self, sparse_scores: sparse.csc_matrix, pos_feature_tuples: List[Tuple[int, str]]):
         self.__scores = sparse_scores
         self.__pos_feature_tuples = pos_feature_tuples
+        self.__sparse_row = None
+
+    @classmethod
+    def from_sparse_row(cls, row_data: np.ndarray, row_indices: np.ndarray, n_features: int,
+                        pos_feature_tuples: List[Tuple[int, str]]) -> FeaturesBagField:
+        """
+        Builds a FeaturesBagField from the data and the column indices of the non-zero entries of a sparse row.
+
+        The sparse matrix returned by the `value` property is only built the first time it is accessed: the csc
+        format stores a pointer for each column of the vocabulary, so building it eagerly for every content would
+        waste time and memory whenever the value of the representation is not needed yet (e.g. when contents are
+        just produced and serialized)
+
+        Args:
+            row_data: scores of the non-zero features
+            row_indices: column indices of the non-zero features
+            n_features: number of columns of the sparse row (size of the vocabulary)
+            pos_feature_tuples: list of tuples containing the position of each feature and the feature itself
+        """
+        features_bag = cls.__new__(cls)
+        features_bag.__scores = None
+        features_bag.__pos_feature_tuples = pos_feature_tuples
+        features_bag.__sparse_row = (row_data, row_indices, n_features)
+
+        return features_bag
 
     @property
     def value(self) -> sparse.csc_matrix:
@@ -63,6 +88,12 @@ class FeaturesBagField(FieldRepresentation):
         Returns:
             features (dict<str, object>): the features dict
         """
+        if self.__scores is None:
+            row_data, row_indices, n_features = self.__sparse_row
+            self.__scores = sparse.csr_matrix((row_data, row_indices, [0, len(row_indices)]),
+                                              shape=(1, n_features)).tocsc()
+            self.__sparse_row = None
+
         return self.__scores
 
     def to_json(self):
@@ -71,13 +102,13 @@ class FeaturesBagField(FieldRepresentation):
 
         return dict(sparse_tfidf=np.array2string(tuple_representation, threshold=np.inf, separator=','),
                     pos_word_tuples=str(self.__pos_feature_tuples),
-                    len_vocabulary=self.__scores.shape[1])
+                    len_vocabulary=self.value.shape[1])
 
     def __str__(self):
-        return str(self.__scores)
+        return str(self.value)
 
     def __eq__(self, other):
-        return np.array_equal(self.__scores, other.__scores) and self.__pos_feature_tuples == other.__pos_feature_tuples
+        return np.array_equal(self.value, other.value) and self.__pos_feature_tuples == other.__pos_feature_tuples
 
 
 class SimpleField(FieldRepresentation):
@@ -155,7 +155,8 @@ class PropertiesFromDataset(ExogenousPropertiesRetrieval):
         for raw_content in raw_source:
 
             if self.__field_name_list is None:
-                prop_dict = raw_content
+                # the row is copied, so that properties don't share the same dict with the raw source
+                prop_dict = dict(raw_content)
             else:
                 prop_dict = {field: raw_content[field] for field in self.__field_name_list
                              if raw_content.get(field) is not None}
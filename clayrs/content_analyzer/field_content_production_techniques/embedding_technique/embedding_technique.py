@@ -25,7 +25,6 @@ from clayrs.content_analyzer.field_content_production_techniques.field_content_p
 from clayrs.content_analyzer.utils.check_tokenization import check_tokenized, tokenize_in_sentences, check_not_tokenized
 from clayrs.utils.class_utils import get_all_implemented_subclasses
 from clayrs.utils.const import logger
-from clayrs.utils.context_managers import get_progbar
 
 
 class EmbeddingTechnique(SingleContentTechnique):
@@ -37,11 +36,14 @@ class EmbeddingTechnique(SingleContentTechnique):
     Args:
         embedding_source (EmbeddingSource): Source where the embeddings vectors for the words in field_data
             are stored.
+        num_cpus: number of processors that must be reserved for the preprocessing of the contents' data. If set to
+            `0`, all cpus available will be used. Be careful though: multiprocessing in python has a substantial
+            memory overhead!
     """
 
-    def __init__(self, embedding_source: EmbeddingSource):
+    def __init__(self, embedding_source: EmbeddingSource, num_cpus: int = 1):
 
-        super().__init__()
+        super().__init__(num_cpus)
 
         self.__embedding_source = embedding_source
 
@@ -105,13 +107,11 @@ class EmbeddingTechnique(SingleContentTechnique):
         # it iterates over all contents contained in the source in order to retrieve the raw data
         # the data contained in the field_name is processed using each information processor in the processor_list
         # the data is passed to the method that will create the single representation
-        with get_progbar(list(source)) as pbar:
+        with self.processed_data_iterator(field_name, preprocessor_list, source) as pbar:
 
-            for content_data in pbar:
+            pbar.set_description(f"Processing and producing contents with {self.__embedding_source}")
 
-                pbar.set_description(f"Processing and producing contents with {self.__embedding_source}")
-
-                processed_data = self.process_data(content_data[field_name], preprocessor_list)
+            for processed_data in pbar:
                 representation_list.append(self.produce_single_repr(processed_data))
 
             representation_list = self.postprocess_representations(representation_list, postprocessor_list)
@@ -155,8 +155,8 @@ class StandardEmbeddingTechnique(EmbeddingTechnique):
     than loading the embedding from the source
     """
 
-    def __init__(self, embedding_source: EmbeddingSource):
-        super().__init__(embedding_source)
+    def __init__(self, embedding_source: EmbeddingSource, num_cpus: int = 1):
+        super().__init__(embedding_source, num_cpus)
 
     def produce_single_repr(self, field_data: Union[List[str], str]) -> EmbeddingField:
         return EmbeddingField(self.embedding_source.load(self.process_data_granularity(field_data)))
@@ -176,12 +176,15 @@ class WordEmbeddingTechnique(StandardEmbeddingTechnique):
 
     Args:
         embedding_source: Any `WordEmbedding` model
+        num_cpus: number of processors that must be reserved for the preprocessing of the contents' data. If set to
+            `0`, all cpus available will be used. Be careful though: multiprocessing in python has a substantial
+            memory overhead!
     """
 
-    def __init__(self, embedding_source: Union[WordEmbeddingLoader, WordEmbeddingLearner, str]):
+    def __init__(self, embedding_source: Union[WordEmbeddingLoader, WordEmbeddingLearner, str], num_cpus: int = 1):
         # if isinstance(embedding_source, str):
         #     embedding_source = self.from_str_to_embedding_source(embedding_source, WordEmbeddingLoader)
-        super().__init__(embedding_source)
+        super().__init__(embedding_source, num_cpus)
 
     def process_data_granularity(self, field_data: Union[List[str], str]) -> List[str]:
         return check_tokenized(field_data)
@@ -190,7 +193,7 @@ class WordEmbeddingTechnique(StandardEmbeddingTechnique):
         return "WordEmbeddingTechnique"
 
     def __repr__(self):
-        return f'WordEmbeddingTechnique(embedding_source={self.embedding_source})'
+        return f'WordEmbeddingTechnique(embedding_source={self.embedding_source}, num_cpus={self.num_cpus})'
 
 
 class SentenceEmbeddingTechnique(StandardEmbeddingTechnique):
@@ -199,12 +202,16 @@ class SentenceEmbeddingTechnique(StandardEmbeddingTechnique):
 
     Args:
         embedding_source: Any `SentenceEmbedding` model
+        num_cpus: number of processors that must be reserved for the preprocessing of the contents' data. If set to
+            `0`, all cpus available will be used. Be careful though: multiprocessing in python has a substantial
+            memory overhead!
     """
 
-    def __init__(self, embedding_source: Union[SentenceEmbeddingLoader, SentenceEmbeddingLearner, str]):
+    def __init__(self, embedding_source: Union[SentenceEmbeddingLoader, SentenceEmbeddingLearner, str],
+                 num_cpus: int = 1):
         # if isinstance(embedding_source, str):
         #     embedding_source = self.from_str_to_embedding_source(embedding_source, SentenceEmbeddingLoader)
-        super().__init__(embedding_source)
+        super().__init__(embedding_source, num_cpus)
 
     def process_data_granularity(self, field_data: Union[List[str], str]) -> List[str]:
         return tokenize_in_sentences(field_data)
@@ -213,7 +220,7 @@ class SentenceEmbeddingTechnique(StandardEmbeddingTechnique):
         return "SentenceEmbeddingTechnique"
 
     def __repr__(self):
-        return f'SentenceEmbeddingTechnique(embedding_source={self.embedding_source})'
+        return f'SentenceEmbeddingTechnique(embedding_source={self.embedding_source}, num_cpus={self.num_cpus})'
 
 
 class DocumentEmbeddingTechnique(StandardEmbeddingTechnique):
@@ -222,12 +229,16 @@ class DocumentEmbeddingTechnique(StandardEmbeddingTechnique):
 
     Args:
         embedding_source: Any `DocumentEmbedding` model
+        num_cpus: number of processors that must be reserved for the preprocessing of the contents' data. If set to
+            `0`, all cpus available will be used. Be careful though: multiprocessing in python has a substantial
+            memory overhead!
     """
 
-    def __init__(self, embedding_source: Union[DocumentEmbeddingLoader, DocumentEmbeddingLearner, str]):
+    def __init__(self, embedding_source: Union[DocumentEmbeddingLoader, DocumentEmbeddingLearner, str],
+                 num_cpus: int = 1):
         # if isinstance(embedding_source, str):
         #     embedding_source = self.from_str_to_embedding_source(embedding_source, DocumentEmbeddingLoader)
-        super().__init__(embedding_source)
+        super().__init__(embedding_source, num_cpus)
 
     def process_data_granularity(self, field_data: Union[List[str], str]) -> List[str]:
         return [check_not_tokenized(field_data)]
@@ -236,7 +247,7 @@ class DocumentEmbeddingTechnique(StandardEmbeddingTechnique):
         return "DocumentEmbeddingTechnique"
 
     def __repr__(self):
-        return f'DocumentEmbeddingTechnique(embedding_source={self.embedding_source})'
+        return f'DocumentEmbeddingTechnique(embedding_source={self.embedding_source}, num_cpus={self.num_cpus})'
 
 
 class CombiningEmbeddingTechnique(EmbeddingTechnique):
@@ -257,8 +268,8 @@ class CombiningEmbeddingTechnique(EmbeddingTechnique):
         the source
     """
 
-    def __init__(self, embedding_source: EmbeddingSource, combining_technique: CombiningTechnique):
-        super().__init__(embedding_source)
+    def __init__(self, embedding_source: EmbeddingSource, combining_technique: CombiningTechnique, num_cpus: int = 1):
+        super().__init__(embedding_source, num_cpus)
         self.__combining_technique = combining_technique
 
     @property
@@ -283,8 +294,8 @@ class CombiningSentenceEmbeddingTechnique(CombiningEmbeddingTechnique):
     Class that generalizes the combining embedding techniques with sentence granularity
     """
 
-    def __init__(self, embedding_source: EmbeddingSource, combining_technique: CombiningTechnique):
-        super().__init__(embedding_source, combining_technique)
+    def __init__(self, embedding_source: EmbeddingSource, combining_technique: CombiningTechnique, num_cpus: int = 1):
+        super().__init__(embedding_source, combining_technique, num_cpus)
 
     def produce_single_repr(self, field_data: Union[List[str], str]) -> EmbeddingField:
         """
@@ -319,13 +330,16 @@ class Word2SentenceEmbedding(CombiningSentenceEmbeddingTechnique):
         embedding_source: Any `WordEmbedding` model
         combining_technique: Technique used to combine embeddings of finer granularity (word-level) to obtain embeddings
             of coarser granularity (sentence-level)
+        num_cpus: number of processors that must be reserved for the preprocessing of the contents' data. If set to
+            `0`, all cpus available will be used. Be careful though: multiprocessing in python has a substantial
+            memory overhead!
     """
 
     def __init__(self, embedding_source: Union[WordEmbeddingLoader, WordEmbeddingLearner, str],
-                 combining_technique: CombiningTechnique):
+                 combining_technique: CombiningTechnique, num_cpus: int = 1):
         # if isinstance(embedding_source, str):
         #     embedding_source = self.from_str_to_embedding_source(embedding_source, WordEmbeddingLoader)
-        super().__init__(embedding_source, combining_technique)
+        super().__init__(embedding_source, combining_technique, num_cpus)
 
     def process_data_granularity(self, field_data: Union[List[str], str]) -> List[str]:
         return check_tokenized(field_data)
@@ -335,7 +349,7 @@ class Word2SentenceEmbedding(CombiningSentenceEmbeddingTechnique):
 
     def __repr__(self):
         return f"Word2SentenceEmbedding(embedding_source={self.embedding_source}, " \
-               f"combining_technique={self.combining_technique})"
+               f"combining_technique={self.combining_technique}, num_cpus={self.num_cpus})"
 
 
 class CombiningDocumentEmbeddingTechnique(CombiningEmbeddingTechnique):
@@ -343,8 +357,8 @@ class CombiningDocumentEmbeddingTechnique(CombiningEmbeddingTechnique):
     Class that generalizes the combining embedding techniques with document granularity
     """
 
-    def __init__(self, embedding_source: EmbeddingSource, combining_technique: CombiningTechnique):
-        super().__init__(embedding_source, combining_technique)
+    def __init__(self, embedding_source: EmbeddingSource, combining_technique: CombiningTechnique, num_cpus: int = 1):
+        super().__init__(embedding_source, combining_technique, num_cpus)
 
     def produce_single_repr(self, field_data: Union[List[str], str]) -> EmbeddingField:
         """
@@ -371,13 +385,16 @@ class Word2DocEmbedding(CombiningDocumentEmbeddingTechnique):
         embedding_source: Any `WordEmbedding` model
         combining_technique: Technique used to combine embeddings of finer granularity (word-level) to obtain embeddings
             of coarser granularity (doc-level)
+        num_cpus: number of processors that must be reserved for the preprocessing of the contents' data. If set to
+            `0`, all cpus available will be used. Be careful though: multiprocessing in python has a substantial
+            memory overhead!
     """
 
     def __init__(self, embedding_source: Union[WordEmbeddingLoader, WordEmbeddingLearner, str],
-                 combining_technique: CombiningTechnique):
+                 combining_technique: CombiningTechnique, num_cpus: int = 1):
         # if isinstance(embedding_source, str):
         #     embedding_source = self.from_str_to_embedding_source(embedding_source, WordEmbeddingLoader)
-        super().__init__(embedding_source, combining_technique)
+        super().__init__(embedding_source, combining_technique, num_cpus)
 
     def process_data_granularity(self, field_data: Union[List[str], str]) -> List[str]:
         return check_tokenized(field_data)
@@ -387,7 +404,7 @@ class Word2DocEmbedding(CombiningDocumentEmbeddingTechnique):
 
     def __repr__(self):
         return f"Word2DocEmbedding(embedding_source={self.embedding_source}, " \
-               f"combining_technique={self.combining_technique})"
+               f"combining_technique={self.combining_technique}, num_cpus={self.num_cpus})"
 
 
 class Sentence2DocEmbedding(CombiningDocumentEmbeddingTechnique):
@@ -399,13 +416,16 @@ class Sentence2DocEmbedding(CombiningDocumentEmbeddingTechnique):
         embedding_source: Any `SentenceEmbedding` model
         combining_technique: Technique used to combine embeddings of finer granularity (sentence-level) to obtain
             embeddings of coarser granularity (doc-level)
+        num_cpus: number of processors that must be reserved for the preprocessing of the contents' data. If set to
+            `0`, all cpus available will be used. Be careful though: multiprocessing in python has a substantial
+            memory overhead!
     """
 
     def __init__(self, embedding_source: Union[SentenceEmbeddingLoader, SentenceEmbeddingLearner, str],
-                 combining_technique: CombiningTechnique):
+                 combining_technique: CombiningTechnique, num_cpus: int = 1):
         # if isinstance(embedding_source, str):
         #     embedding_source = self.from_str_to_embedding_source(embedding_source, SentenceEmbeddingLoader)
-        super().__init__(embedding_source, combining_technique)
+        super().__init__(embedding_source, combining_technique, num_cpus)
 
     def process_data_granularity(self, field_data: Union[List[str], str]) -> List[str]:
         return tokenize_in_sentences(field_data)
@@ -415,7 +435,7 @@ class Sentence2DocEmbedding(CombiningDocumentEmbeddingTechnique):
 
     def __repr__(self):
         return f"Sentence2DocEmbedding(embedding_source={self.embedding_source}, " \
-               f"combining_technique={self.combining_technique})"
+               f"combining_technique={self.combining_technique}, num_cpus={self.num_cpus})"
 
 
 class DecombiningEmbeddingTechnique(EmbeddingTechnique):
@@ -432,8 +452,8 @@ class DecombiningEmbeddingTechnique(EmbeddingTechnique):
 
     """
 
-    def __init__(self, embedding_source: EmbeddingSource):
-        super().__init__(embedding_source)
+    def __init__(self, embedding_source: EmbeddingSource, num_cpus: int = 1):
+        super().__init__(embedding_source, num_cpus)
 
     @abstractmethod
     def produce_single_repr(self, field_data: Union[List[str], str]) -> EmbeddingField:  # return array numpy
@@ -450,8 +470,8 @@ class DecombiningInWordsEmbeddingTechnique(DecombiningEmbeddingTechnique):
     """
 
     def __init__(self, embedding_source: Union[SentenceEmbeddingLoader, SentenceEmbeddingLearner,
-                                               DocumentEmbeddingLoader, DocumentEmbeddingLearner]):
-        super().__init__(embedding_source)
+                                               DocumentEmbeddingLoader, DocumentEmbeddingLearner], num_cpus: int = 1):
+        super().__init__(embedding_source, num_cpus)
 
     @abstractmethod
     def produce_single_repr(self, field_data: Union[List[str], str]) -> EmbeddingField:
@@ -465,12 +485,18 @@ class DecombiningInWordsEmbeddingTechnique(DecombiningEmbeddingTechnique):
 class Sentence2WordEmbedding(DecombiningInWordsEmbeddingTechnique):
     """
     Class that makes use of a sentence granularity embedding source to produce an embedding matrix with word granularity
+
+    Args:
+        embedding_source: Any `SentenceEmbedding` model
+        num_cpus: number of processors that must be reserved for the preprocessing of the contents' data. If set to
+            `0`, all cpus available will be used. Be careful though: multiprocessing in python has a substantial
+            memory overhead!
     """
 
-    def __init__(self, embedding_source: Union[SentenceEmbeddingLoader, SentenceEmbeddingLearner]):
+    def __init__(self, embedding_source: Union[SentenceEmbeddingLoader, SentenceEmbeddingLearner], num_cpus: int = 1):
         # if isinstance(embedding_source, str):
         #     embedding_source = self.from_str_to_embedding_source(embedding_source, SentenceEmbeddingLoader)
-        super().__init__(embedding_source)
+        super().__init__(embedding_source, num_cpus)
 
     def produce_single_repr(self, field_data: Union[List[str], str]) -> EmbeddingField:
         """
@@ -493,4 +519,4 @@ class Sentence2WordEmbedding(DecombiningInWordsEmbeddingTechnique):
         return "Sentence2WordEmbedding"
 
     def __repr__(self):
-        return f'Sentence2WordEmbedding(embedding_source={self.embedding_source})'
+        return f'Sentence2WordEmbedding(embedding_source={self.embedding_source}, num_cpus={self.num_cpus})'
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import contextlib
+import functools
 from abc import ABC, abstractmethod
-from typing import List, Union, Callable, Optional, TYPE_CHECKING
+from typing import List, Union, Callable, Optional, Any, Tuple, Iterator, TYPE_CHECKING
 
 import numpy as np
 from scipy.sparse import csr_matrix
 
 from clayrs.utils.const import logger
-from clayrs.utils.context_managers import get_progbar
+from clayrs.utils.context_managers import get_progbar, get_iterator_parallel
 
 if TYPE_CHECKING:
     from clayrs.content_analyzer.content_representation.content import FieldRepresentation
@@ -48,6 +50,59 @@ class FieldContentProductionTechnique(ABC):
 
         return processed_data
 
+    @staticmethod
+    def process_data_batch(data_list: List[Any],
+                           preprocessor_list: List[InformationProcessor]) -> List[Union[List[str], str]]:
+        """
+        The data passed as argument is processed using the preprocessor list (also given as argument), exactly like
+        `process_data()`, but the whole batch is passed to each preprocessor at once, so that preprocessors able to
+        process multiple data in a single pass (e.g. spacy pipelines) can exploit it. Identical str data is processed
+        only once
+
+        Args:
+            data_list (List[Any]): list of data on which each preprocessor, in the preprocessor list, will be used
+            preprocessor_list (List[InformationProcessor]): list of preprocessors to apply to the data
+
+        Returns:
+            List containing the processed data, in the same order of the data given as argument
+        """
+        if len(preprocessor_list) == 0:
+            return list(data_list)
+
+        batch_to_process, data_positions = FieldContentProductionTechnique._deduplicate_str_data(data_list)
+
+        processed_batch = batch_to_process
+        for preprocessor in preprocessor_list:
+            processed_batch = preprocessor.process_batch(processed_batch)
+
+        return FieldContentProductionTechnique._expand_processed_data(processed_batch, data_positions)
+
+    @staticmethod
+    def _deduplicate_str_data(data_list: List[Any]) -> Tuple[List[Any], List[int]]:
+        # each data is mapped to the position of its (unique) occurrence in the batch that will be processed.
+        # Only str data is deduplicated, other data may not be hashable
+        unique_str_positions = {}
+        data_positions = []
+        batch_to_process = []
+        for data in data_list:
+            if isinstance(data, str):
+                if data not in unique_str_positions:
+                    unique_str_positions[data] = len(batch_to_process)
+                    batch_to_process.append(data)
+                data_positions.append(unique_str_positions[data])
+            else:
+                data_positions.append(len(batch_to_process))
+                batch_to_process.append(data)
+
+        return batch_to_process, data_positions
+
+    @staticmethod
+    def _expand_processed_data(processed_batch: List[Any], data_positions: List[int]) -> List[Any]:
+        # a copy is returned so that the tokens list of a content is not shared with the one of other contents
+        return [processed_batch[position].copy() if isinstance(processed_batch[position], list)
+                else processed_batch[position]
+                for position in data_positions]
+
     @staticmethod
     def postprocess_representations(representations: List[FieldRepresentation],
                                     postprocessor_list: List[PostProcessor]) -> List[FieldRepresentation]:
@@ -131,8 +186,76 @@ class SingleContentTechnique(TextualContentTechnique):
     Technique specialized in the production of representations that don't need any external information in order
     to be processed. This type of technique only considers the raw data within the content's field to create
     the complex representation
+
+    Args:
+        num_cpus: number of processors that must be reserved for the preprocessing of the contents' data. If set to
+            `0`, all cpus available will be used. Be careful though: multiprocessing in python has a substantial
+            memory overhead!
     """
 
+    # number of contents whose data is processed at once when a single processor is reserved for the technique
+    _processing_batch_size = 1000
+
+    def __init__(self, num_cpus: int = 1):
+        self.num_cpus = num_cpus
+
+    @contextlib.contextmanager
+    def processed_data_iterator(self, field_name: str, preprocessor_list: List[InformationProcessor],
+                                source: RawInformationSource):
+        """
+        Context manager which yields a progress bar over the data contained in the field_name of each content in the
+        source, processed using each information processor in the processor_list.
+
+        Data is processed lazily while the progress bar is iterated, so that the progress of the processing phase is
+        shown and the processed data of all contents is never kept in memory at once.
+        If more than one processor is reserved for the technique, the data of different contents is processed in
+        parallel, otherwise it is processed in batches (see `process_data_batch()`). In both cases identical
+        str data is processed only once (within each batch in the single processor case)
+
+        Args:
+            field_name (str): name of the contents' field whose data will be processed
+            preprocessor_list (List[InformationProcessor]): list of preprocessors to apply to the data
+            source (RawInformationSource): source where the raw data of the contents is stored
+        """
+        raw_data_list = [content_data[field_name] for content_data in source]
+
+        if self.num_cpus == 1:
+            processed_data_iterator = self._iter_processed_batches(raw_data_list, preprocessor_list)
+
+            with get_progbar(processed_data_iterator, total=len(raw_data_list)) as pbar:
+                yield pbar
+        else:
+            batch_to_process, data_positions = self._deduplicate_str_data(raw_data_list)
+            process_data = functools.partial(self.process_data, preprocessor_list=preprocessor_list)
+
+            with get_iterator_parallel(self.num_cpus, process_data, batch_to_process) as processed_iterator:
+                processed_data_iterator = self._iter_expanded_data(processed_iterator, data_positions)
+
+                with get_progbar(processed_data_iterator, total=len(raw_data_list)) as pbar:
+                    yield pbar
+
+    def _iter_processed_batches(self, data_list: List[Any],
+                                preprocessor_list: List[InformationProcessor]) -> Iterator[Union[List[str], str]]:
+        for start in range(0, len(data_list), self._processing_batch_size):
+            yield from self.process_data_batch(data_list[start:start + self._processing_batch_size], preprocessor_list)
+
+    @staticmethod
+    def _iter_expanded_data(processed_iterator: Iterator[Any], data_positions: List[int]) -> Iterator[Any]:
+        # unique data is processed in order of first occurrence, so a position never seen before is always the next
+        # one returned by the iterator. Processed data is kept only until its last occurrence has been yielded
+        last_occurrences = {position: i for i, position in enumerate(data_positions)}
+        processed_cache = {}
+        for i, position in enumerate(data_positions):
+            if position not in processed_cache:
+                processed_cache[position] = next(processed_iterator)
+
+            if last_occurrences[position] == i:
+                yield processed_cache.pop(position)
+            else:
+                # a copy is returned so that the tokens list of a content is not shared with the one of other contents
+                processed_data = processed_cache[position]
+                yield processed_data.copy() if isinstance(processed_data, list) else processed_data
+
     def produce_content(self, field_name: str, preprocessor_list: List[InformationProcessor],
                         postprocessor_list: List[PostProcessor],
                         source: RawInformationSource) -> List[FieldRepresentation]:
@@ -144,12 +267,11 @@ class SingleContentTechnique(TextualContentTechnique):
         """
         representation_list: List[FieldRepresentation] = []
 
-        with get_progbar(list(source)) as pbar:
-            # it iterates over all contents contained in the source in order to retrieve the raw data
-            # the data contained in the field_name is processed using each information processor in the processor_list
-            # the data is passed to the method that will create the single representation
-            for content_data in pbar:
-                processed_data = self.process_data(content_data[field_name], preprocessor_list)
+        # it iterates over all contents contained in the source in order to retrieve the raw data
+        # the data contained in the field_name is processed using each information processor in the processor_list
+        # the data is passed to the method that will create the single representation
+        with self.processed_data_iterator(field_name, preprocessor_list, source) as pbar:
+            for processed_data in pbar:
                 representation_list.append(self.produce_single_repr(processed_data))
 
         representation_list = self.postprocess_representations(representation_list, postprocessor_list)
@@ -192,13 +314,9 @@ class CollectionBasedTechnique(TextualContentTechnique):
         # in this phase the data is also processed using the preprocessor_list
         dataset_len = self.dataset_refactor(source, field_name, preprocessor_list)
 
-        representation_list: List[FieldRepresentation] = []
-
-        # produces the representation, retrieving it from the dataset given the content's position in the refactored
-        # dataset
-
-        for i in range(0, dataset_len):
-            representation_list.append(self.produce_single_repr(i))
+        # produces the representations, retrieving them from the dataset given the contents' position in the
+        # refactored dataset
+        representation_list = self.produce_all_repr(dataset_len)
 
         representation_list = self.postprocess_representations(representation_list, postprocessor_list)
 
@@ -222,6 +340,21 @@ class CollectionBasedTechnique(TextualContentTechnique):
         """
         raise NotImplementedError
 
+    def produce_all_repr(self, dataset_len: int) -> List[FieldRepresentation]:
+        """
+        This method creates the FieldRepresentation of every content in the refactored dataset. By default it calls
+        `produce_single_repr()` for each content position, but techniques which can build all the representations at
+        once from the refactored dataset should override it
+
+        Args:
+            dataset_len (int): length of the refactored dataset
+
+        Returns:
+            List[FieldRepresentation]: complex representations of the contents, in the same order of the refactored
+                dataset
+        """
+        return [self.produce_single_repr(i) for i in range(0, dataset_len)]
+
     @abstractmethod
     def dataset_refactor(self, information_source: RawInformationSource, field_name: str,
                          preprocessor_list: List[InformationProcessor]) -> int:
@@ -248,6 +381,11 @@ class CollectionBasedTechnique(TextualContentTechnique):
         raise NotImplementedError
 
 
+@functools.lru_cache(maxsize=65536)
+def _cached_cast(dtype: Callable, field_data: str):
+    return dtype(field_data)
+
+
 class OriginalData(SingleContentTechnique):
     """
     Technique used to retrieve the original data within the content's raw source without applying any
@@ -260,13 +398,31 @@ class OriginalData(SingleContentTechnique):
 
     Args:
         dtype: If specified, data will be cast to the chosen dtype
+        num_cpus: number of processors that must be reserved for the preprocessing of the contents' data. If set to
+            `0`, all cpus available will be used. Be careful though: multiprocessing in python has a substantial
+            memory overhead!
 
     """
 
-    def __init__(self, dtype: Callable = str):
-        super().__init__()
+    def __init__(self, dtype: Callable = str, num_cpus: int = 1):
+        super().__init__(num_cpus)
         self.__dtype = dtype
 
+    def produce_content(self, field_name: str, preprocessor_list: List[InformationProcessor],
+                        postprocessor_list: List[PostProcessor],
+                        source: RawInformationSource) -> List[FieldRepresentation]:
+
+        # common case in which the original str data must be kept as it is: there's nothing to process or to cast,
+        # so the whole processing pipeline is skipped
+        if self.__dtype is str and len(preprocessor_list) == 0:
+            representation_list = [SimpleField(field_data) if type(field_data) is str
+                                   else self.produce_single_repr(field_data)
+                                   for field_data in (content_data[field_name] for content_data in source)]
+
+            return self.postprocess_representations(representation_list, postprocessor_list)
+
+        return super().produce_content(field_name, preprocessor_list, postprocessor_list, source)
+
     def produce_single_repr(self, field_data: Union[List[str], str]) -> SimpleField:
         """
         The contents' raw data in the given field_name is extracted and stored in a SimpleField object.
@@ -274,13 +430,19 @@ class OriginalData(SingleContentTechnique):
         No further operations are done on the data in order to keep it in the original form.
         Because of that the preprocessor_list is ignored and not used by this technique
         """
-        return SimpleField(self.__dtype(check_not_tokenized(field_data)))
+        field_data = check_not_tokenized(field_data)
+
+        # casting str data to a number is deterministic, so the result for identical data can be reused
+        if self.__dtype in (int, float) and isinstance(field_data, str):
+            return SimpleField(_cached_cast(self.__dtype, field_data))
+
+        return SimpleField(self.__dtype(field_data))
 
     def __str__(self):
         return "OriginalData"
 
     def __repr__(self):
-        return f'OriginalData(dtype={self.__dtype})'
+        return f'OriginalData(dtype={self.__dtype}, num_cpus={self.num_cpus})'
 
 
 class FromNPY(FieldContentProductionTechnique):
@@ -321,12 +483,13 @@ class FromNPY(FieldContentProductionTechnique):
 
         representation_list: List[FieldRepresentation] = []
 
-        with get_progbar(list(source)) as pbar:
-            # it iterates over all contents contained in the source in order to retrieve the raw data
-            # the data contained in the field_name is processed using each information processor in the processor_list
-            # the data is passed to the method that will create the single representation
-            for content_data in pbar:
-                representation_list.append(self.produce_single_repr(content_data[field_name]))
+        # the data contained in the field_name is retrieved from all contents contained in the source and is then
+        # passed to the method that will create the single representation
+        field_data_list = [content_data[field_name] for content_data in source]
+
+        with get_progbar(field_data_list) as pbar:
+            for field_data in pbar:
+                representation_list.append(self.produce_single_repr(field_data))
 
         representation_list = self.postprocess_representations(representation_list, postprocessor_list)
 
@@ -353,6 +516,54 @@ class FromNPY(FieldContentProductionTechnique):
         return f'FromNPY(npy_file_path={self.npy_file_path})'
 
 
+def _features_bag_from_row(matrix: csr_matrix, feature_names: np.ndarray, row: int) -> FeaturesBagField:
+    """
+    Builds the FeaturesBagField of a single row of a csr matrix by slicing its underlying arrays directly.
+
+    Indexing the matrix (`matrix[row, :]` or `matrix.getrow(row)`) would allocate a new sparse matrix just to read
+    the non-zero entries of the row, while `indptr` already tells where they are stored in `indices` and `data`
+    """
+    start, end = matrix.indptr[row], matrix.indptr[row + 1]
+    row_indices = matrix.indices[start:end]
+    row_data = matrix.data[start:end]
+
+    # explicit zeros may be stored in the matrix, they are not considered features of the content
+    nonzero_feature_index = row_indices[row_data != 0]
+    pos_feature_tuple = list(zip(nonzero_feature_index.tolist(), feature_names[nonzero_feature_index].tolist()))
+
+    # a copy of the row is kept, otherwise the representation would keep the whole matrix alive
+    return FeaturesBagField.from_sparse_row(row_data.copy(), row_indices.copy(), matrix.shape[1], pos_feature_tuple)
+
+
+def _features_bags_from_matrix(matrix: csr_matrix, feature_names: np.ndarray) -> List[FeaturesBagField]:
+    """
+    Builds the FeaturesBagField of every row of a csr matrix in a single pass over its underlying arrays.
+
+    The (position, feature) tuples of all rows are computed at once over the whole matrix, so that for each row only
+    the slicing of the already computed data is left
+    """
+    indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+    n_features = matrix.shape[1]
+
+    # explicit zeros may be stored in the matrix, they are not considered features of the content.
+    # nonzero_indptr is the equivalent of indptr once explicit zeros are removed
+    nonzero_mask = data != 0
+    nonzero_indices = indices[nonzero_mask]
+    nonzero_indptr = np.concatenate(([0], np.cumsum(nonzero_mask)))[indptr].tolist()
+
+    nonzero_features = feature_names[nonzero_indices]
+    all_pos_feature_tuples = list(zip(nonzero_indices.tolist(), nonzero_features.tolist()))
+
+    indptr = indptr.tolist()
+
+    # rows are views of the data and indices arrays of the matrix: since every row is used by a representation,
+    # no copy is needed
+    return [FeaturesBagField.from_sparse_row(data[start:end], indices[start:end], n_features,
+                                             all_pos_feature_tuples[nonzero_start:nonzero_end])
+            for start, end, nonzero_start, nonzero_end in zip(indptr[:-1], indptr[1:],
+                                                              nonzero_indptr[:-1], nonzero_indptr[1:])]
+
+
 class TfIdfTechnique(CollectionBasedTechnique):
     """
     Abstract class that generalizes the implementations that produce a Bag of words with tf-idf metric
@@ -360,19 +571,18 @@ class TfIdfTechnique(CollectionBasedTechnique):
 
     def __init__(self):
         self._tfidf_matrix: Optional[csr_matrix] = None
-        self._feature_names: Optional[List[str]] = None
+        # object array rather than list, so that the names of multiple features can be retrieved with fancy indexing
+        self._feature_names: Optional[np.ndarray] = None
 
     def produce_single_repr(self, content_position: int) -> FeaturesBagField:
         """
         Retrieves the tf-idf values, for terms in document in the defined content_position,
         from the pre-computed word - document matrix.
         """
-        nonzero_feature_index = self._tfidf_matrix[content_position, :].nonzero()[1]
+        return _features_bag_from_row(self._tfidf_matrix, self._feature_names, content_position)
 
-        tfidf_sparse = self._tfidf_matrix.getrow(content_position).tocsc()
-        pos_word_tuple = [(pos, self._feature_names[pos]) for pos in nonzero_feature_index]
-
-        return FeaturesBagField(tfidf_sparse, pos_word_tuple)
+    def produce_all_repr(self, dataset_len: int) -> List[FeaturesBagField]:
+        return _features_bags_from_matrix(self._tfidf_matrix, self._feature_names)
 
     @abstractmethod
     def dataset_refactor(self, information_source: RawInformationSource, field_name: str,
@@ -391,19 +601,18 @@ class SynsetDocumentFrequency(CollectionBasedTechnique):
 
     def __init__(self):
         self._synset_matrix: Optional[csr_matrix] = None
-        self._synset_names: Optional[List[str]] = None
+        # object array rather than list, so that the names of multiple synsets can be retrieved with fancy indexing
+        self._synset_names: Optional[np.ndarray] = None
 
     def produce_single_repr(self, content_position: int) -> FeaturesBagField:
         """
         Retrieves the tf-idf values, for terms in document in the defined content_position,
         from the pre-computed word - document matrix.
         """
-        nonzero_feature_index = self._synset_matrix[content_position, :].nonzero()[1]
-
-        count_dense = self._synset_matrix.getrow(content_position).tocsc()
-        pos_word_tuple = [(pos, self._synset_names[pos]) for pos in nonzero_feature_index]
+        return _features_bag_from_row(self._synset_matrix, self._synset_names, content_position)
 
-        return FeaturesBagField(count_dense, pos_word_tuple)
+    def produce_all_repr(self, dataset_len: int) -> List[FeaturesBagField]:
+        return _features_bags_from_matrix(self._synset_matrix, self._synset_names)
 
     @abstractmethod
     def dataset_refactor(self, information_source: RawInformationSource, field_name: str,
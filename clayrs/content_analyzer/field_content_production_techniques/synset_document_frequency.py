@@ -1,5 +1,6 @@
 from __future__ import annotations
 import re
+import numpy as np
 from sklearn.feature_extraction.text import CountVectorizer
 from typing import List, TYPE_CHECKING
 
@@ -60,11 +61,10 @@ class PyWSDSynsetDocumentFrequency(SynsetDocumentFrequency):
                          preprocessor_list: List[InformationProcessor]):
 
         all_synsets = []
-        with get_progbar(information_source) as pbar:
+        raw_data_list = [raw_content[field_name] for raw_content in information_source]
+        with get_progbar(self.process_data_batch(raw_data_list, preprocessor_list)) as pbar:
             pbar.set_description("Computing synset frequency with wordnet")
-            for raw_content in pbar:
-                processed_field_data = self.process_data(raw_content[field_name], preprocessor_list)
-
+            for processed_field_data in pbar:
                 processed_field_data = check_not_tokenized(processed_field_data)
 
                 synset_list = ' '.join([synset.name()
@@ -79,8 +79,10 @@ class PyWSDSynsetDocumentFrequency(SynsetDocumentFrequency):
         cv = CountVectorizer(tokenizer=split_tok)
         res = cv.fit_transform(all_synsets)
 
-        self._synset_matrix = res
-        self._synset_names = cv.get_feature_names_out()
+        # rows of the matrix are sliced to build the representations, so it must be in csr format with sorted indices
+        self._synset_matrix = res.tocsr(copy=False)
+        self._synset_matrix.sort_indices()
+        self._synset_names = np.asarray(cv.get_feature_names_out(), dtype=object)
 
         return self._synset_matrix.shape[0]
 
@@ -94,16 +94,15 @@ class SkLearnTfIdf(TfIdfTechnique):
         # Then calls TfIdfVectorizer on this collection, obtaining term-document tf-idf matrix,
         # the corpus is then deleted
 
-        corpus = []
         logger.info(f"Computing tf-idf with {str(self)}")
-        for raw_content in information_source:
-            processed_field_data = self.process_data(raw_content[field_name], preprocessor_list)
+        raw_data_list = [raw_content[field_name] for raw_content in information_source]
+        corpus = [check_not_tokenized(processed_field_data)
+                  for processed_field_data in self.process_data_batch(raw_data_list, preprocessor_list)]
 
-            processed_field_data = check_not_tokenized(processed_field_data)
-            corpus.append(processed_field_data)
-
-        self._tfidf_matrix = self._sk_vectorizer.fit_transform(corpus)
-        self._feature_names = self._sk_vectorizer.get_feature_names_out()
+        # rows of the matrix are sliced to build the representations, so it must be in csr format with sorted indices
+        self._tfidf_matrix = self._sk_vectorizer.fit_transform(corpus).tocsr(copy=False)
+        self._tfidf_matrix.sort_indices()
+        self._feature_names = np.asarray(self._sk_vectorizer.get_feature_names_out(), dtype=object)
 
         return self._tfidf_matrix.shape[0]
 
@@ -141,9 +140,9 @@ class WhooshTfIdf(TfIdfTechnique):
         index = KeywordIndex(f'./tf_idf_{field_name}')
         index.init_writing(True)
         dataset_len = 0
-        for raw_content in information_source:
+        raw_data_list = [raw_content[field_name] for raw_content in information_source]
+        for processed_field_data in self.process_data_batch(raw_data_list, preprocessor_list):
             index.new_content()
-            processed_field_data = self.process_data(raw_content[field_name], preprocessor_list)
 
             processed_field_data = check_tokenized(processed_field_data)
             index.new_field(field_name, processed_field_data)
@@ -156,8 +155,10 @@ class WhooshTfIdf(TfIdfTechnique):
         index.delete()
 
         vectorizer = DictVectorizer(sparse=True)
-        self._tfidf_matrix = vectorizer.fit_transform(tfidf_dicts)
-        self._feature_names = vectorizer.get_feature_names_out()
+        # rows of the matrix are sliced to build the representations, so it must be in csr format with sorted indices
+        self._tfidf_matrix = vectorizer.fit_transform(tfidf_dicts).tocsr(copy=False)
+        self._tfidf_matrix.sort_indices()
+        self._feature_names = np.asarray(vectorizer.get_feature_names_out(), dtype=object)
 
         return dataset_len
 
@@ -13,6 +13,19 @@ class InformationProcessor(ABC):
     def process(self, field_data: Any):
         raise NotImplementedError
 
+    def process_batch(self, field_data_list: List[Any]) -> List[Any]:
+        """
+        Process a batch of data at once. By default each data is processed separately with the `process()` method,
+        processors which are able to process multiple data more efficiently in a single pass should override it
+
+        Args:
+            field_data_list: list of data to be processed
+
+        Returns:
+            List containing the processed data, in the same order of the data given as argument
+        """
+        return [self.process(field_data) for field_data in field_data_list]
+
     @abstractmethod
     def __eq__(self, other):
         raise NotImplementedError
@@ -1,3 +1,4 @@
+import functools
 import itertools
 import string
 from typing import List
@@ -15,6 +16,17 @@ from nltk.stem.snowball import SnowballStemmer
 from clayrs.content_analyzer.information_processor.information_processor_abstract import NLP
 from clayrs.content_analyzer.utils.check_tokenization import check_not_tokenized
 
+# regexes are compiled once rather than being looked up in the re cache for every processed text
+_multiple_whitespaces_regex = re.compile(' +')
+_url_regex = re.compile('http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]| '
+                        '[!*(), ]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+
+
+@functools.lru_cache(maxsize=None)
+def _stopwords_set(lang: str) -> frozenset:
+    # the stopwords corpus of a language is read only once rather than for every processed text
+    return frozenset(stopwords.words(lang))
+
 
 class NLTK(NLP):
     """
@@ -98,6 +110,7 @@ class NLTK(NLP):
         self.remove_punctuation = remove_punctuation
         self.pos_tag = pos_tag
         self.__full_lang_code = lang
+        self.__tokenizer = ToktokTokenizer()
 
     def __download_corpus(self):
         try:
@@ -143,7 +156,7 @@ class NLTK(NLP):
         # as well as optional <url>, <hashtag>, etc.
         # It works for sentences so we first sentence tokenize
         sentences = sent_tokenize(text, self.__full_lang_code)
-        sentences_tokenized = ToktokTokenizer().tokenize_sents(sentences)
+        sentences_tokenized = self.__tokenizer.tokenize_sents(sentences)
         return list(itertools.chain.from_iterable(sentences_tokenized))
 
     def __stopwords_removal_operation(self, text) -> List[str]:
@@ -156,7 +169,7 @@ class NLTK(NLP):
         Returns:
             filtered_sentence (List<str>): list of words from the text, without the stopwords
         """
-        stop_words = set(stopwords.words(self.__full_lang_code))
+        stop_words = _stopwords_set(self.__full_lang_code)
         filtered_sentence = []
         for word_token in text:
             if word_token.lower() not in stop_words:
@@ -233,7 +246,7 @@ class NLTK(NLP):
         Returns:
             str: input text, multiple whitespaces removed
         """
-        return re.sub(' +', ' ', text)
+        return _multiple_whitespaces_regex.sub(' ', text)
 
     @staticmethod
     def __remove_punctuation(text) -> List[str]:
@@ -261,9 +274,7 @@ class NLTK(NLP):
         """
         tagged_token = []
         for token in text:
-            if re.match('http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]| '
-                        '[!*(), ]|(?:%[0-9a-fA-F][0-9a-fA-F]))+',
-                        token):
+            if _url_regex.match(token):
                 tagged_token.append("<URL>")
             else:
                 tagged_token.append(token)
@@ -136,10 +136,19 @@ class VisualBagOfWords(EmbeddingInputPostProcessor):
         # instantiate the visual bag of features as sparse matrix and apply a weighting schema to it
         sparse_repr = scipy.sparse.csr_matrix((data, indices, indptr))
         sparse_repr = self.apply_weights(sparse_repr)
-        for single_repr in sparse_repr:
+
+        # the entries of each row are sliced directly from the underlying arrays of the matrix, since iterating over
+        # the matrix rows would allocate a new sparse matrix for each one of them
+        repr_indptr, repr_indices, repr_data = sparse_repr.indptr, sparse_repr.indices, sparse_repr.data
+        n_features = sparse_repr.shape[1]
+        for start, end in zip(repr_indptr[:-1], repr_indptr[1:]):
+            row_indices = repr_indices[start:end]
+            row_data = repr_data[start:end]
+
             new_field_repr_list.append(
-                FeaturesBagField(single_repr.tocsc(),
-                                 [(index, str(codewords[index])) for index in pd.unique(single_repr.nonzero()[1])]))
+                FeaturesBagField.from_sparse_row(row_data, row_indices, n_features,
+                                                 [(index, str(codewords[index]))
+                                                  for index in pd.unique(row_indices[row_data != 0])]))
         return new_field_repr_list
 
     @abstractmethod
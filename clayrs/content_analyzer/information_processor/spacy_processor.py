@@ -1,3 +1,4 @@
+import re
 from typing import List
 import warnings
 
@@ -11,6 +12,9 @@ with warnings.catch_warnings():
 from clayrs.content_analyzer.information_processor.information_processor_abstract import NLP
 from clayrs.content_analyzer.utils.check_tokenization import check_not_tokenized
 
+# compiled once rather than being looked up in the re cache for every processed text
+_multiple_whitespaces_regex = re.compile(' +')
+
 
 class Spacy(NLP):
     """
@@ -94,7 +98,15 @@ class Spacy(NLP):
         # download the model if not present. In any case load it
         if model not in spacy.cli.info()['pipelines']:
             spacy.cli.download(model)
-        self._nlp = spacy.load(model)
+        # only the components of the pipeline needed by the operations requested are run: tokens attributes such as
+        # `is_stop`, `is_punct` and `like_url` are lexical, so they don't need any component at all
+        pipe_to_disable = ['parser', 'textcat']
+        if not self.lemmatization:
+            pipe_to_disable.extend(['tagger', 'attribute_ruler', 'lemmatizer'])
+        if not self.named_entity_recognition:
+            pipe_to_disable.append('ner')
+
+        self._nlp = spacy.load(model, disable=pipe_to_disable)
 
         # Adding custom rule of preserving '<URL>' token and in general token
         # wrapped by '<...>'
@@ -128,13 +140,6 @@ class Spacy(NLP):
         Returns:
              List<str>: a list of words
         """
-        pipe_to_disable = ['tagger', 'parser', 'textcat']
-
-        if not self.lemmatization:
-            pipe_to_disable.append('lemmatizer')
-        if not self.named_entity_recognition:
-            pipe_to_disable.append('ner')
-
         return list(self._nlp(text))
 
     def __stopwords_removal_operation(self, text) -> List[Token]:
@@ -191,8 +196,7 @@ class Spacy(NLP):
         Returns:
             str: input text, multiple whitespaces removed
         """
-        import re
-        return re.sub(' +', ' ', text)
+        return _multiple_whitespaces_regex.sub(' ', text)
 
     def __url_tagging_operation(self, text) -> List[Token]:
         """
@@ -243,11 +247,40 @@ class Spacy(NLP):
         Returns:
             field_data: list of str or dict in case of named entity recognition
 
+        """
+        field_data = self.__tokenization_operation(self.__prepare_text(field_data))
+
+        return self.__process_tokens(field_data)
+
+    def process_batch(self, field_data_list: List[str]) -> List[List[str]]:
+        """
+        Process all the data in a single pass of the spacy pipeline (`nlp.pipe()`), which is way faster than
+        processing each data separately
+
+        Args:
+            field_data_list: list of contents to be processed
+
+        Returns:
+            List containing, for each content, the list of str (or dict in case of named entity recognition)
+        """
+        text_list = [self.__prepare_text(field_data) for field_data in field_data_list]
+
+        return [self.__process_tokens(list(doc)) for doc in self._nlp.pipe(text_list, batch_size=1000)]
+
+    def __prepare_text(self, field_data: str) -> str:
+        """
+        Operations on the running text which must be executed before tokenizing it
         """
         field_data = check_not_tokenized(field_data)
         if self.strip_multiple_whitespaces:
             field_data = self.__strip_multiple_whitespaces_operation(field_data)
-        field_data = self.__tokenization_operation(field_data)
+
+        return field_data
+
+    def __process_tokens(self, field_data: List[Token]) -> List[str]:
+        """
+        Operations on the tokenized text requested by the user
+        """
         if self.named_entity_recognition:
             field_data = self.__named_entity_recognition_operation(field_data)
         if self.remove_punctuation:
@@ -273,3 +273,49 @@ class CSVFile(RawInformationSource):
         return f'CSVFile(file_path={self.file_path}, separator={self.__separator}, has_header={self.__has_header}, ' \
                f'encoding={self.encoding})'
 
+
+
+class InMemorySource(RawInformationSource):
+    """
+    Wrapper for another raw source. The first time it is iterated, all the rows of the wrapped source are read and
+    kept in memory, so that the following iterations (and `len()` calls) don't need to read and parse the original
+    source again.
+
+    This is useful since the contents production iterates over the source multiple times (to create the id of each
+    content, to retrieve exogenous properties and to produce each field representation)
+
+    Args:
+        source: raw source whose rows will be kept in memory
+    """
+
+    def __init__(self, source: RawInformationSource):
+        super().__init__(source.file_path, source.encoding)
+        self.__source = source
+        self.__rows = None
+
+    @property
+    def representative_name(self) -> str:
+        """
+        Method which returns a meaningful name for the raw source: it's the one of the wrapped source
+        """
+        return self.__source.representative_name
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        if self.__rows is None:
+            # list() would call len() on the source as a size hint, reading it one more time: the iterator of the
+            # source is consumed instead
+            self.__rows = list(iter(self.__source))
+
+        return iter(self.__rows)
+
+    def __len__(self):
+        if self.__rows is None:
+            return len(self.__source)
+
+        return len(self.__rows)
+
+    def __str__(self):
+        return "InMemorySource"
+
+    def __repr__(self):
+        return f'InMemorySource(source={repr(self.__source)})'
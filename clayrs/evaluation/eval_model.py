@@ -114,7 +114,7 @@ class EvalModel:
         """
         self._metric_list.append(metric)
 
-    def fit(self, user_id_list: Optional[List[str]] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    def fit(self, user_id_list: Optional[List[str]] = None, num_cpus: int = 1) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         This method performs the actual evaluation of the recommendation frames passed as input in the constructor of
         the class
@@ -139,6 +139,9 @@ class EvalModel:
         Args:
             user_id_list: list of string ids for the users to consider in the evaluation (note that only string ids are
                 accepted and not their mapped integers)
+            num_cpus: number of processors that must be reserved for evaluating multiple splits in parallel. If set to
+                `0`, all cpus available will be used. Be careful though: multiprocessing in python has a substantial
+                memory overhead!
 
         Returns:
             The first DataFrame contains the **system result** for every metric inside the metric_list
@@ -169,7 +172,8 @@ class EvalModel:
             final_pred_list = self._pred_list
             final_truth_list = self._truth_list
 
-        sys_result, users_result = MetricEvaluator(final_pred_list, final_truth_list, self._pop_per_items).eval_metrics(self.metric_list)
+        sys_result, users_result = MetricEvaluator(final_pred_list, final_truth_list,
+                                                   self._pop_per_items).eval_metrics(self.metric_list, num_cpus)
 
         # we save the sys result for report yaml
         self._yaml_report_result = sys_result.to_dict(orient='index')
@@ -1,12 +1,14 @@
 from __future__ import annotations
+import functools
 from typing import List, Tuple, Union, TYPE_CHECKING, Dict
 
 import pandas as pd
 
 from clayrs.content_analyzer.ratings_manager.ratings import Prediction, Rank, Ratings
 from clayrs.evaluation.metrics import Metric, FairnessMetric
+from clayrs.evaluation.metrics.plot_metrics import PlotMetric
 
-from clayrs.utils.context_managers import get_progbar
+from clayrs.utils.context_managers import get_iterator_parallel
 
 
 class MetricEvaluator:
@@ -49,15 +51,46 @@ class MetricEvaluator:
     def __repr__(self):
         return f'MetricEvaluator(pred_list={self._pred_list}, truth_list={self._truth_list})'
 
-    def eval_metrics(self, metric_list: List[Metric]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    def _get_common_users_splits(self) -> List[Split]:
+        """
+        Private method which builds, for each non-empty pair of predictions and truth, the split to evaluate.
+        Users can be different between predictions and truth, so only those who are in both are kept
+
+        Returns:
+            List of `Split` objects containing filtered predictions and truth, one for each non-empty pair
+        """
+        split_list = []
+
+        for pred, truth in zip(self._pred_list, self._truth_list):
+            if len(pred) != 0 and len(truth) != 0:
+
+                common_user_ids = list(
+                    set(pred.unique_user_id_column).intersection(set(truth.unique_user_id_column))
+                )
+
+                prediction_user_idxs = pred.user_map.convert_seq_str2int(common_user_ids)
+                truth_user_idxs = truth.user_map.convert_seq_str2int(common_user_ids)
+
+                split_list.append(Split(pred.filter_ratings(prediction_user_idxs),
+                                        truth.filter_ratings(truth_user_idxs)))
+
+        return split_list
+
+    def eval_metrics(self, metric_list: List[Metric], num_cpus: int = 1) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Method which effectively evaluates recommendations generated with the list of metric passed as argument.
 
         It returns two Pandas DataFrame, the first one containing system results on all metrics specified, the second
         one containing each users results for every metric eligible
 
+        If multiple splits must be evaluated, they can be evaluated in parallel by setting the `num_cpus` parameter.
+        Plot metrics are always performed serially in the main process instead, since the name of the file in which
+        the plot of each split is saved depends on the files already saved for the other splits
+
         Args:
             metric_list (List[Metric]): List of metric on which recommendations need to be evaluated
+            num_cpus: number of processors that must be reserved for the method. If set to `0`, all cpus available will
+                be used. Be careful though: multiprocessing in python has a substantial memory overhead!
 
         Returns:
             The first DataFrame will contain the system result for every metric specified inside the metric list,
@@ -68,56 +101,60 @@ class MetricEvaluator:
         frames_to_concat_users = []
         frames_to_concat_system = []
 
-        with get_progbar(metric_list) as pbar:
+        # splits are the same for every metric, so they are filtered only once
+        split_list = self._get_common_users_splits()
 
-            for metric in pbar:
-                pbar.set_description(desc=f"Performing {metric}")
+        # plot metrics which don't overwrite files choose a free file name by checking which ones already exist:
+        # if splits were evaluated by different processes, two of them could choose the same name
+        parallel_metric_list = [metric for metric in metric_list if not isinstance(metric, PlotMetric)]
+        serial_metric_list = [metric for metric in metric_list if isinstance(metric, PlotMetric)]
 
-                metric_result_list = []
+        # splits are independent of each other, so each one is evaluated on all metrics by a different process.
+        # Split objects can't be pickled, that's why predictions and truth are passed separately
+        perform_on_split = functools.partial(_perform_metrics, parallel_metric_list, self._pop_per_items)
+        with get_iterator_parallel(num_cpus, perform_on_split,
+                                   [split.pred for split in split_list], [split.truth for split in split_list],
+                                   progress_bar=True, total=len(split_list)) as pbar:
+            pbar.set_description(desc=f"Performing {len(metric_list)} metrics on each split")
 
-                for pred, truth in zip(self._pred_list, self._truth_list):
-                    if len(pred) != 0 and len(truth) != 0:
+            parallel_results_by_split = list(pbar)
 
-                        # users can be different between predictions and truth, we only consider those
-                        # who are in both
-                        common_user_ids = list(
-                            set(pred.unique_user_id_column).intersection(set(truth.unique_user_id_column))
-                        )
+        serial_results_by_split = [_perform_metrics(serial_metric_list, self._pop_per_items, split.pred, split.truth)
+                                   for split in split_list]
 
-                        prediction_user_idxs = pred.user_map.convert_seq_str2int(common_user_ids)
-                        truth_user_idxs = truth.user_map.convert_seq_str2int(common_user_ids)
+        # results of each split are put back in the same order of the metric list
+        results_by_split = []
+        for parallel_results, serial_results in zip(parallel_results_by_split, serial_results_by_split):
+            parallel_results = iter(parallel_results)
+            serial_results = iter(serial_results)
+            results_by_split.append([next(serial_results) if isinstance(metric, PlotMetric) else next(parallel_results)
+                                     for metric in metric_list])
 
-                        pred = pred.filter_ratings(prediction_user_idxs)
-                        truth = truth.filter_ratings(truth_user_idxs)
-                        if issubclass(metric.__class__, FairnessMetric):
-                            metric_result = metric.perform(Split(pred, truth), self._pop_per_items)
-                        else:
-                            metric_result = metric.perform(Split(pred, truth))
+        for i in range(len(metric_list)):
+            metric_result_list = [split_results[i] for split_results in results_by_split]
 
-                        metric_result_list.append(metric_result)
+            # if in future results for each fold for each user
+            # set index as from_id and concat axis = 1
+            total_results_metric = pd.concat(metric_result_list)
 
-                # if in future results for each fold for each user
-                # set index as from_id and concat axis = 1
-                total_results_metric = pd.concat(metric_result_list)
+            if not total_results_metric.empty:
+                total_results_metric = total_results_metric.set_index('user_id')
+                system_results = total_results_metric.loc[['sys']]
 
-                if not total_results_metric.empty:
-                    total_results_metric = total_results_metric.set_index('user_id')
-                    system_results = total_results_metric.loc[['sys']]
+                # this means that if a system result is nan, it won't be present in the final df.
+                # Maybe there's a better solution?
+                # (This removal is done in case metric for users and system have different name eg. AP for users and
+                # MAP for sys)
+                system_results = system_results.dropna(axis='columns', how='all')
 
-                    # this means that if a system result is nan, it won't be present in the final df.
-                    # Maybe there's a better solution?
-                    # (This removal is done in case metric for users and system have different name eg. AP for users and
-                    # MAP for sys)
-                    system_results = system_results.dropna(axis='columns', how='all')
+                each_user_result = total_results_metric.drop(['sys'])
+                each_user_result = each_user_result.dropna(axis=1, how='all')
 
-                    each_user_result = total_results_metric.drop(['sys'])
-                    each_user_result = each_user_result.dropna(axis=1, how='all')
+                if not each_user_result.empty:
+                    frames_to_concat_users.append(each_user_result)
 
-                    if not each_user_result.empty:
-                        frames_to_concat_users.append(each_user_result)
-
-                    if not system_results.empty:
-                        frames_to_concat_system.append(system_results)
+                if not system_results.empty:
+                    frames_to_concat_system.append(system_results)
 
         # concat horizontally results of each metric both for users and system
         final_result_users = pd.DataFrame(columns=['user_id'])
@@ -143,6 +180,23 @@ class MetricEvaluator:
         return final_result_system, final_result_users
 
 
+def _perform_metrics(metric_list: List[Metric], pop_per_items: Dict,
+                     pred: Union[Prediction, Rank], truth: Ratings) -> List[pd.DataFrame]:
+    split = Split(pred, truth)
+
+    metric_result_list = []
+    for metric in metric_list:
+        # fairness metrics also need the popularity of each item
+        if issubclass(metric.__class__, FairnessMetric):
+            metric_result = metric.perform(split, pop_per_items)
+        else:
+            metric_result = metric.perform(split)
+
+        metric_result_list.append(metric_result)
+
+    return metric_result_list
+
+
 class Split:
     """
     Class container for two pandas DataFrame
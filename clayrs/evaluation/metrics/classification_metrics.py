@@ -9,6 +9,7 @@ if TYPE_CHECKING:
     from clayrs.evaluation.eval_pipeline_modules.metric_evaluator import Split
 
 from clayrs.evaluation.metrics.metrics import Metric, handler_different_users
+from clayrs.evaluation.utils import get_relevant_hits
 
 
 class ClassificationMetric(Metric):
@@ -53,47 +54,41 @@ class ClassificationMetric(Metric):
         # so that every metric must simply implement the method _calc_metric(...).
         # Thanks to polymorphism, everything will work without changing this main method
 
-        pred = split.pred
         truth = split.truth
 
-        split_result = {'user_id': [], str(self): []}
-        sys_confusion_matrix = np.array([[0, 0],
-                                         [0, 0]], dtype=np.int32)
-
-        # users in truth and pred of the split to evaluate must be the same!
-        user_idx_truth = truth.unique_user_idx_column
-        user_idx_pred = pred.user_map.convert_seq_str2int(truth.unique_user_id_column)
+        # relevant items recommended are found for all users at once, each metric then only needs to count them
+        user_idx_truth, offsets, hits, n_relevant = get_relevant_hits(split, self.relevant_threshold)
+        n_predictions = np.diff(offsets)
 
-        for uidx_pred, uidx_truth in zip(user_idx_pred, user_idx_truth):
-            user_predictions_indices = pred.get_user_interactions(uidx_pred, as_indices=True)
-            user_truth_indices = truth.get_user_interactions(uidx_truth, as_indices=True)
+        # only the first 'cutoff' items recommended to each user are considered
+        cutoff = self._get_cutoff(n_predictions, n_relevant)
+        hits_user_pos = np.repeat(np.arange(len(user_idx_truth)), n_predictions)
+        hits_rank = np.arange(len(hits)) - offsets[hits_user_pos]
+        hits_in_cutoff = hits & (hits_rank < cutoff[hits_user_pos])
 
-            user_truth_scores = truth.score_column[user_truth_indices]
-            user_truth_items = truth.item_id_column[user_truth_indices]
+        tp = np.bincount(hits_user_pos, weights=hits_in_cutoff, minlength=len(user_idx_truth)).astype(np.int32)
+        fp = np.minimum(n_predictions, cutoff) - tp
+        fn = n_relevant - tp
 
-            relevant_threshold = self.relevant_threshold
-            if relevant_threshold is None:
-                relevant_threshold = np.nanmean(user_truth_scores)
+        split_result = {'user_id': list(truth.user_map.convert_seq_int2str(user_idx_truth)), str(self): []}
+        sys_confusion_matrix = np.array([[0, 0],
+                                         [0, 0]], dtype=np.int32)
 
-            user_predictions_items = pred.item_id_column[user_predictions_indices]
-            user_truth_relevant_items = user_truth_items[np.where(user_truth_scores >= relevant_threshold)]
+        for user_tp, user_fp, user_fn, user_n_relevant in zip(tp, fp, fn, n_relevant):
 
             # If basically the user has not provided a rating to any items greater than the threshold,
             # then we don't consider it since it's not fault of the system
-            if len(user_truth_relevant_items) != 0:
-                metric_user, user_confusion_matrix = self._perform_single_user(user_predictions_items,
-                                                                               user_truth_relevant_items)
+            if user_n_relevant != 0:
+                user_confusion_matrix = np.array([[user_tp, user_fp],
+                                                  [user_fn, 0]], dtype=np.int32)
+                metric_user = self._calc_metric(user_confusion_matrix)
 
                 sys_confusion_matrix += user_confusion_matrix
             else:
                 metric_user = np.nan
 
-            # temporarily append user_idx, later convert to user id
-            split_result['user_id'].append(uidx_truth)
             split_result[str(self)].append(metric_user)
 
-        split_result['user_id'] = list(truth.user_map.convert_seq_int2str(split_result['user_id']))
-
         # trick to check for nan values, if all values are nan then an exception is thrown
         if all(user_result != user_result for user_result in split_result[str(self)]):
             raise ValueError("No user has a rating above the given threshold! Try lower it")
@@ -117,9 +112,19 @@ class ClassificationMetric(Metric):
         """
         raise NotImplementedError
 
-    @abstractmethod
-    def _perform_single_user(self, user_prediction_items: np.ndarray, user_truth_items: np.ndarray):
-        raise NotImplementedError
+    def _get_cutoff(self, n_predictions: np.ndarray, n_relevant: np.ndarray) -> np.ndarray:
+        """
+        Private method which specifies, for each user, how many items of the recommendation list must be considered.
+        By default the whole recommendation list is considered
+
+        Args:
+            n_predictions: number of items recommended to each user
+            n_relevant: number of relevant items in the truth of each user
+
+        Returns:
+            Numpy array containing the cutoff of each user
+        """
+        return n_predictions
 
 
 class Precision(ClassificationMetric):
@@ -169,16 +174,6 @@ class Precision(ClassificationMetric):
         fp = confusion_matrix[0, 1]
         return self.precision((tp + fp) and tp / (tp + fp) or 0)  # safediv between tp and (tp + fp)
 
-    def _perform_single_user(self, user_predictions_items: np.ndarray, user_truth_relevant_items: np.ndarray):
-        tp = len(np.intersect1d(user_predictions_items, user_truth_relevant_items))
-        fp = len(user_predictions_items) - tp
-
-        # we do not compute the full confusion matrix for the user
-        useful_confusion_matrix_user = np.array([[tp, fp],
-                                                 [0, 0]], dtype=np.int32)
-
-        return self._calc_metric(useful_confusion_matrix_user), useful_confusion_matrix_user
-
 
 class PrecisionAtK(Precision):
     r"""
@@ -231,16 +226,8 @@ class PrecisionAtK(Precision):
         return f"PrecisionAtK(k={self.k}, relevant_threshold={self.relevant_threshold}, sys_average={self.sys_avg}, " \
                f"precision={self.precision})"
 
-    def _perform_single_user(self, user_predictions_items: np.ndarray, user_truth_relevant_items: np.ndarray):
-        user_prediction_cut = user_predictions_items[:self.k]
-
-        tp = len(np.intersect1d(user_prediction_cut, user_truth_relevant_items))
-        fp = len(user_prediction_cut) - tp
-
-        useful_confusion_matrix_user = np.array([[tp, fp],
-                                                 [0, 0]], dtype=np.int32)
-
-        return self._calc_metric(useful_confusion_matrix_user), useful_confusion_matrix_user
+    def _get_cutoff(self, n_predictions: np.ndarray, n_relevant: np.ndarray) -> np.ndarray:
+        return np.full(len(n_predictions), self.k)
 
 
 class RPrecision(Precision):
@@ -286,17 +273,9 @@ class RPrecision(Precision):
         return f"RPrecision(relevant_threshold={self.relevant_threshold}, sys_average={self.sys_avg}, " \
                f"precision={self.precision})"
 
-    def _perform_single_user(self, user_predictions_items: np.ndarray, user_truth_relevant_items: np.ndarray):
-        r = len(user_truth_relevant_items)
-        user_prediction_cut = user_predictions_items[:r]
-
-        tp = len(np.intersect1d(user_prediction_cut, user_truth_relevant_items))
-        fp = len(user_prediction_cut) - tp
-
-        useful_confusion_matrix_user = np.array([[tp, fp],
-                                                 [0, 0]], dtype=np.int32)
-
-        return self._calc_metric(useful_confusion_matrix_user), useful_confusion_matrix_user
+    def _get_cutoff(self, n_predictions: np.ndarray, n_relevant: np.ndarray) -> np.ndarray:
+        # r is the number of relevant items of each user
+        return n_relevant
 
 
 class Recall(ClassificationMetric):
@@ -347,15 +326,6 @@ class Recall(ClassificationMetric):
         fn = confusion_matrix[1, 0]
         return self.precision((tp + fn) and tp / (tp + fn) or 0)  # safediv between tp and (tp + fn)
 
-    def _perform_single_user(self, user_predictions_items: np.ndarray, user_truth_relevant_items: np.ndarray):
-        tp = len(np.intersect1d(user_predictions_items, user_truth_relevant_items))
-        fn = len(user_truth_relevant_items) - tp
-
-        useful_confusion_matrix_user = np.array([[tp, 0],
-                                                 [fn, 0]], dtype=np.int32)
-
-        return self._calc_metric(useful_confusion_matrix_user), useful_confusion_matrix_user
-
 
 class RecallAtK(Recall):
     r"""
@@ -408,16 +378,8 @@ class RecallAtK(Recall):
         return f"RecallAtK(k={self.k}, relevant_threshold={self.relevant_threshold}, sys_average={self.sys_avg}, " \
                f"precision={self.precision})"
 
-    def _perform_single_user(self, user_predictions_items: np.ndarray, user_truth_relevant_items: np.ndarray):
-        user_prediction_cut = user_predictions_items[:self.k]
-
-        tp = len(np.intersect1d(user_prediction_cut, user_truth_relevant_items))
-        fn = len(user_truth_relevant_items) - tp
-
-        useful_confusion_matrix_user = np.array([[tp, 0],
-                                                 [fn, 0]], dtype=np.int32)
-
-        return self._calc_metric(useful_confusion_matrix_user), useful_confusion_matrix_user
+    def _get_cutoff(self, n_predictions: np.ndarray, n_relevant: np.ndarray) -> np.ndarray:
+        return np.full(len(n_predictions), self.k)
 
 
 class FMeasure(ClassificationMetric):
@@ -493,16 +455,6 @@ class FMeasure(ClassificationMetric):
 
         return fbeta
 
-    def _perform_single_user(self, user_predictions_items: np.ndarray, user_truth_relevant_items: np.ndarray):
-        tp = len(np.intersect1d(user_predictions_items, user_truth_relevant_items))
-        fp = len(user_predictions_items) - tp
-        fn = len(user_truth_relevant_items) - tp
-
-        useful_confusion_matrix_user = np.array([[tp, fp],
-                                                 [fn, 0]], dtype=np.int32)
-
-        return self._calc_metric(useful_confusion_matrix_user), useful_confusion_matrix_user
-
 
 class FMeasureAtK(FMeasure):
     r"""
@@ -566,14 +518,5 @@ class FMeasureAtK(FMeasure):
         return f"FMeasureAtK(k={self.k}, beta={self.beta}, relevant_threshold={self.relevant_threshold}, " \
                f"sys_average={self.sys_avg}, precision={self.precision})"
 
-    def _perform_single_user(self, user_predictions_items: np.ndarray, user_truth_relevant_items: np.ndarray):
-        user_prediction_cut = user_predictions_items[:self.k]
-
-        tp = len(np.intersect1d(user_prediction_cut, user_truth_relevant_items))
-        fp = len(user_prediction_cut) - tp
-        fn = len(user_truth_relevant_items) - tp
-
-        useful_confusion_matrix_user = np.array([[tp, fp],
-                                                 [fn, 0]], dtype=np.int32)
-
-        return self._calc_metric(useful_confusion_matrix_user), useful_confusion_matrix_user
+    def _get_cutoff(self, n_predictions: np.ndarray, n_relevant: np.ndarray) -> np.ndarray:
+        return np.full(len(n_predictions), self.k)
@@ -9,6 +9,7 @@ if TYPE_CHECKING:
     from clayrs.recsys.partitioning import Split
 
 from clayrs.evaluation.metrics.metrics import Metric, handler_different_users
+from clayrs.evaluation.utils import get_relevant_hits
 
 
 class RankingMetric(Metric):
@@ -417,40 +418,37 @@ class MAP(RankingMetric):
 
         return user_ap
 
+    def _get_cutoff(self, n_predictions: np.ndarray) -> np.ndarray:
+        # by default the whole recommendation list of each user is considered
+        return n_predictions
+
     @handler_different_users
     def perform(self, split: Split):
-        pred = split.pred
         truth = split.truth
 
-        split_result = {'user_id': [], 'AP': []}
+        # AP is computed for all users at once: like in _compute_ap(), each occurrence of a relevant item is a hit
+        user_idx_truth, offsets, hits, n_relevant = get_relevant_hits(split, self.relevant_threshold,
+                                                                      first_occurrence_only=False)
+        n_predictions = np.diff(offsets)
 
-        # users in truth and pred of the split to evaluate must be the same!
-        user_idx_truth = truth.unique_user_idx_column
-        user_idx_pred = pred.user_map.convert_seq_str2int(truth.unique_user_id_column)
+        hits_user_pos = np.repeat(np.arange(len(user_idx_truth)), n_predictions)
+        hits_rank = np.arange(len(hits)) - offsets[hits_user_pos]
+        hits &= hits_rank < self._get_cutoff(n_predictions)[hits_user_pos]
 
-        for uidx_pred, uidx_truth in zip(user_idx_pred, user_idx_truth):
-            user_predictions_idxs = pred.get_user_interactions(uidx_pred, as_indices=True)
-            user_truth_idxs = truth.get_user_interactions(uidx_truth, as_indices=True)
+        # true positives found by each user up to each position of its recommendation list
+        cumulative_hits = np.concatenate(([0], np.cumsum(hits)))
+        tp_array = cumulative_hits[1:] - cumulative_hits[offsets[:-1]][hits_user_pos]
 
-            user_truth_scores = truth.score_column[user_truth_idxs]
-            user_truth_items = truth.item_id_column[user_truth_idxs]
+        # precision is computed at the position of each hit and then summed for each user
+        precision_array = tp_array[hits] / (hits_rank[hits] + 1)
+        cumulative_precision = np.bincount(hits_user_pos[hits], weights=precision_array,
+                                           minlength=len(user_idx_truth))
 
-            relevant_threshold = self.relevant_threshold
-            if relevant_threshold is None:
-                relevant_threshold = np.nanmean(user_truth_scores)
-
-            user_predictions_items = pred.item_id_column[user_predictions_idxs]
-            user_truth_relevant_items = user_truth_items[np.where(user_truth_scores >= relevant_threshold)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            users_ap = np.where(n_relevant != 0, (1 / n_relevant) * cumulative_precision, np.nan)
 
-            if len(user_truth_relevant_items) != 0:
-                user_ap = self._compute_ap(user_predictions_items, user_truth_relevant_items)
-            else:
-                user_ap = np.nan
-
-            split_result['user_id'].append(uidx_truth)
-            split_result['AP'].append(user_ap)  # for users we are computing Average Precision
-
-        split_result['user_id'] = list(truth.user_map.convert_seq_int2str(split_result['user_id']))
+        # for users we are computing Average Precision
+        split_result = {'user_id': list(truth.user_map.convert_seq_int2str(user_idx_truth)), 'AP': users_ap}
         df_users = pd.DataFrame(split_result)
 
         # for the system we are computing Mean Average Precision
@@ -510,6 +508,9 @@ class MAPAtK(MAP):
 
         return super()._compute_ap(user_predictions_items, user_truth_relevant_items)
 
+    def _get_cutoff(self, n_predictions: np.ndarray) -> np.ndarray:
+        return np.full(len(n_predictions), self.k)
+
     def __str__(self):
         return "MAPAtK"
 
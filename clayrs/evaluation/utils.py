@@ -1,10 +1,14 @@
 from __future__ import annotations
 import itertools
-from typing import Set, Dict, List, TYPE_CHECKING
+from typing import Set, Dict, List, TYPE_CHECKING, Optional, Tuple
 from collections import Counter
 
+import numpy as np
+import pandas as pd
+
 if TYPE_CHECKING:
     from clayrs.content_analyzer import Ratings
+    from clayrs.recsys.partitioning import Split
 
 
 def get_item_popularity(original_ratings: Ratings) -> Dict:
@@ -101,3 +105,77 @@ def get_avg_pop(items: List, pop_by_item: Dict) -> float:
     popularities = [pop_by_item.get(item, 0.0) for item in items]
 
     return sum(popularities) / len(items)
+
+
+def get_relevant_hits(split: Split, relevant_threshold: Optional[float] = None,
+                      first_occurrence_only: bool = True) -> Tuple[np.ndarray, ...]:
+    """
+    Find, for all users of the split at once, which of their recommended items are relevant in the truth.
+
+    An item is relevant for a user if the score given to it in the truth is >= `relevant_threshold`. If
+    `relevant_threshold` is not specified, the mean score of the user in the truth is used. If an item is
+    recommended more than once to the same user, by default it is a hit only the first time it appears.
+
+    Users of predictions and truth of the split must be the same
+
+    Args:
+        split: `Split` object containing predictions and truth
+        relevant_threshold: score from which an item of the truth is considered relevant. If not specified, the mean
+            score of each user will be used
+        first_occurrence_only: if set to False, every occurrence of a relevant item recommended more than once to the
+            same user is a hit
+
+    Returns:
+        The integer ids of the users according to the truth mapping, in the same order of
+            `truth.unique_user_idx_column`
+
+        The offsets of the predictions of each user: hits of the i-th user are in `hits[offsets[i]:offsets[i + 1]]`,
+            in the same order of the predictions
+
+        The boolean hits array, where each value says whether the corresponding predicted item is relevant
+
+        The number of relevant items in the truth for each user
+    """
+    pred = split.pred
+    truth = split.truth
+
+    user_idx_truth = truth.unique_user_idx_column
+    user_idx_pred = pred.user_map.convert_seq_str2int(truth.unique_user_id_column)
+    n_users = len(user_idx_truth)
+
+    # position of the user of each interaction in the user_idx_truth array
+    truth_user_pos = pd.Index(user_idx_truth).get_indexer(truth.user_idx_column)
+    pred_user_pos = pd.Index(user_idx_pred).get_indexer(pred.user_idx_column)
+
+    truth_scores = truth.score_column
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if relevant_threshold is None:
+            # mean score of each user, nan scores are not considered
+            not_nan = ~np.isnan(truth_scores)
+            scores_sum = np.bincount(truth_user_pos[not_nan], weights=truth_scores[not_nan], minlength=n_users)
+            scores_count = np.bincount(truth_user_pos[not_nan], minlength=n_users)
+            relevant_mask = truth_scores >= (scores_sum / scores_count)[truth_user_pos]
+        else:
+            relevant_mask = truth_scores >= relevant_threshold
+
+    # string ids of truth and predictions are encoded together, so that each (user, item) pair is a single integer
+    truth_items = truth.item_id_column
+    items_codes, unique_items = pd.factorize(np.concatenate((truth_items, pred.item_id_column)))
+    truth_keys = truth_user_pos.astype(np.int64) * len(unique_items) + items_codes[:len(truth_items)]
+    pred_keys = pred_user_pos.astype(np.int64) * len(unique_items) + items_codes[len(truth_items):]
+
+    # predictions of each user are made contiguous, keeping their original order
+    pred_keys = pred_keys[np.argsort(pred_user_pos, kind='stable')]
+    offsets = np.zeros(n_users + 1, dtype=int)
+    offsets[1:] = np.cumsum(np.bincount(pred_user_pos, minlength=n_users))
+
+    hits = np.isin(pred_keys, truth_keys[relevant_mask])
+
+    if first_occurrence_only:
+        first_occurrences = np.zeros(len(pred_keys), dtype=bool)
+        first_occurrences[np.unique(pred_keys, return_index=True)[1]] = True
+
+        hits &= first_occurrences
+    n_relevant = np.bincount(truth_user_pos[relevant_mask], minlength=n_users)
+
+    return user_idx_truth, offsets, hits, n_relevant
@@ -179,9 +179,20 @@ class ContentBasedAlgorithm(Algorithm):
         # of the first item
         first_arr = next(single_item_fused_gen())
         if any(isinstance(x, sparse.csc_matrix) for x in first_arr):
-            X_vectorized = (sparse.hstack(single_arr) for single_arr in single_item_fused_gen())
-
-            X_vectorized = sparse.vstack(X_vectorized, format='csr')
+            # rather than building a sparse row for each item (which would allocate a new sparse matrix per item),
+            # the same representation of all items is stacked at once, and only the resulting blocks are concatenated
+            fused_items = list(single_item_fused_gen())
+
+            X_blocks = []
+            for repr_position in range(len(first_arr)):
+                repr_block = [single_arr[repr_position] for single_arr in fused_items]
+                if sparse.issparse(repr_block[0]):
+                    X_blocks.append(sparse.vstack(repr_block, format='csr'))
+                else:
+                    X_blocks.append(sparse.csr_matrix(np.vstack([np.atleast_1d(item_repr)
+                                                                 for item_repr in repr_block])))
+
+            X_vectorized = sparse.hstack(X_blocks, format='csr')
 
             if as_array is True:
                 X_vectorized = X_vectorized.toarray()
@@ -5,6 +5,7 @@ from typing import Union, Any
 import numpy as np
 from scipy import sparse
 
+from sklearn.base import clone
 from sklearn.linear_model import LinearRegression, BayesianRidge, Ridge, SGDRegressor, ARDRegression, \
     HuberRegressor, PassiveAggressiveRegressor
 from sklearn.linear_model._stochastic_gradient import DEFAULT_EPSILON
@@ -18,13 +19,13 @@ class Regressor(ABC):
     """
 
     def __init__(self, model, currentframe):
-        self.__model = model
+        self._model = model
 
         self._repr_string = autorepr(self, currentframe)
 
     @property
     def model(self):
-        return self.__model
+        return self._model
 
     def fit(self, X: list, Y: list = None):
         """
@@ -46,7 +47,7 @@ class Regressor(ABC):
             X: list containing Training data.
             Y: list containing Training targets.
         """
-        self.__model = self.__model.fit(X, Y)
+        self._model = self._model.fit(X, Y)
 
     def predict(self, X_pred: list):
         """
@@ -62,7 +63,7 @@ class Regressor(ABC):
         Args:
             X_pred: list containing data to predict.
         """
-        return self.__model.predict(X_pred)
+        return self._model.predict(X_pred)
 
     def __repr__(self):
         return self._repr_string
@@ -116,11 +117,8 @@ class SkRidge(Regressor):
 
         super().__init__(model, inspect.currentframe())
 
-    def fit(self, X: Union[np.ndarray, sparse.csr_matrix], Y: list = None):
-        self.model.fit(X.toarray() if isinstance(X, sparse.csr_matrix) else X, Y)
-
-    def predict(self, X_pred: Union[np.ndarray, sparse.csr_matrix]):
-        return self.model.predict(X_pred.toarray() if isinstance(X_pred, sparse.csr_matrix) else X_pred)
+    # Ridge natively supports sparse input (the "auto" solver picks "sparse_cg" in that case),
+    # so X is forwarded as is without being densified
 
     def __str__(self):
         return "SkRidge"
@@ -158,10 +156,15 @@ class SkBayesianRidge(Regressor):
         super().__init__(model, inspect.currentframe())
 
     def fit(self, X: Union[np.ndarray, sparse.csr_matrix], Y: list = None):
-        self.model.fit(X.toarray() if isinstance(X, sparse.csr_matrix) else X, Y)
+        self._model.fit(X.toarray() if sparse.issparse(X) else X, Y)
 
     def predict(self, X_pred: Union[np.ndarray, sparse.csr_matrix]):
-        return self.model.predict(X_pred.toarray() if isinstance(X_pred, sparse.csr_matrix) else X_pred)
+        # the model doesn't accept sparse input, but predictions are simply X_pred @ coef_ + intercept_,
+        # which can be computed on the sparse matrix directly instead of densifying it
+        if sparse.issparse(X_pred):
+            return X_pred.dot(self._model.coef_) + self._model.intercept_
+
+        return self._model.predict(X_pred)
 
     def __str__(self):
         return "SkBayesianRidge"
@@ -235,10 +238,15 @@ class SkARDRegression(Regressor):
         super().__init__(model, inspect.currentframe())
 
     def fit(self, X: Union[np.ndarray, sparse.csr_matrix], Y: list = None):
-        self.model.fit(X.toarray() if isinstance(X, sparse.csr_matrix) else X, Y)
+        self._model.fit(X.toarray() if sparse.issparse(X) else X, Y)
 
     def predict(self, X_pred: Union[np.ndarray, sparse.csr_matrix]):
-        return self.model.predict(X_pred.toarray() if isinstance(X_pred, sparse.csr_matrix) else X_pred)
+        # the model doesn't accept sparse input, but predictions are simply X_pred @ coef_ + intercept_,
+        # which can be computed on the sparse matrix directly instead of densifying it
+        if sparse.issparse(X_pred):
+            return X_pred.dot(self._model.coef_) + self._model.intercept_
+
+        return self._model.predict(X_pred)
 
     def __str__(self):
         return "SkARDRegression"
@@ -251,6 +259,10 @@ class SkHuberRegressor(Regressor):
     the regressor Huber directly from sklearn.
 
     Sklearn documentation: [here](https://scikit-learn.org/stable/modules/generated/sklearn.linear_model.HuberRegressor.html)
+
+    The regressor is fit for each user: by setting `warm_start=True`, the optimization of each fit starts from the
+    coefficients of the previous one, which may need fewer iterations. Be careful though: the results of each user
+    would then depend on the order in which users are fit (e.g. if `max_iter` is reached before convergence)
     """
 
     def __init__(self, *,
@@ -265,6 +277,15 @@ class SkHuberRegressor(Regressor):
 
         super().__init__(model, inspect.currentframe())
 
+    def fit(self, X: Union[np.ndarray, sparse.csr_matrix], Y: list = None):
+        # with warm_start, the previous coefficients can't be used as starting point if the number of features is
+        # different
+        n_features = X.shape[1] if sparse.issparse(X) else np.asarray(X).shape[1]
+        if hasattr(self._model, "coef_") and self._model.coef_.shape[0] != n_features:
+            self._model = clone(self._model)
+
+        self._model.fit(X, Y)
+
     def __str__(self):
         return "SkHuberRegressor"
 
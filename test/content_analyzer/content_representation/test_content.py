@@ -1,11 +1,29 @@
+import pickle
 from unittest import TestCase
 
 import numpy as np
+from scipy import sparse
 
 from clayrs.content_analyzer.content_representation.content import Content, PropertiesDict, FeaturesBagField
 from clayrs.content_analyzer.content_representation.representation_container import RepresentationContainer
 
 
+class TestFeaturesBagField(TestCase):
+    def test_from_sparse_row(self):
+        pos_features = [(1, 'first'), (3, 'second')]
+        features_bag = FeaturesBagField.from_sparse_row(np.array([0.5, 0.2]), np.array([1, 3]), 5, pos_features)
+
+        # the lazy representation can be serialized before its value is built
+        features_bag = pickle.loads(pickle.dumps(features_bag))
+
+        expected_value = sparse.csr_matrix(np.array([[0, 0.5, 0, 0.2, 0]])).tocsc()
+        self.assertIsInstance(features_bag.value, sparse.csc_matrix)
+        self.assertEqual(features_bag.value.shape, (1, 5))
+        np.testing.assert_array_equal(expected_value.toarray(), features_bag.value.toarray())
+
+        self.assertEqual(FeaturesBagField(expected_value, pos_features).to_json(), features_bag.to_json())
+
+
 class TestContent(TestCase):
     def test_append_remove_field(self):
         """
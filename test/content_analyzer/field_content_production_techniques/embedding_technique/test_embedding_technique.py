@@ -27,6 +27,15 @@ class TestEmbeddingTechnique(TestCase):
         self.assertEqual(len(embedding_list), 20)
         self.assertIsInstance(embedding_list[0], EmbeddingField)
 
+    def test_num_cpus(self):
+        technique = Word2DocEmbedding(GensimFastText(), Centroid(), num_cpus=2)
+
+        # the number of cpus used for preprocessing is passed down to SingleContentTechnique
+        self.assertEqual(2, technique.num_cpus)
+        self.assertIn("num_cpus=2", repr(technique))
+
+        self.assertEqual(1, WordEmbeddingTechnique(GensimFastText()).num_cpus)
+
     def test_produce_content_str(self):
         self.skipTest("Test requires internet but is too complex to be mocked")
         technique = WordEmbeddingTechnique('glove-twitter-25')
@@ -6,13 +6,84 @@ import numpy as np
 
 from clayrs.content_analyzer.content_representation.content import SimpleField
 from clayrs.content_analyzer.field_content_production_techniques.field_content_production_technique import \
-    OriginalData, FromNPY
+    OriginalData, FromNPY, FieldContentProductionTechnique, SingleContentTechnique
+from clayrs.content_analyzer.information_processor.information_processor_abstract import NLP
 from clayrs.content_analyzer.raw_information_source import JSONFile, DATFile
 from test import dir_test_files
 
 file_path = os.path.join(dir_test_files, "movies_info_reduced.json")
 
 
+class SplitCounter(NLP):
+    # simple NLP processor which counts how many times it has been applied
+
+    def __init__(self):
+        self.n_calls = 0
+
+    def process(self, field_data: str):
+        self.n_calls += 1
+        return field_data.split() if isinstance(field_data, str) else list(field_data)
+
+    def __eq__(self, other):
+        return isinstance(other, SplitCounter)
+
+    def __str__(self):
+        return "SplitCounter"
+
+    def __repr__(self):
+        return "SplitCounter()"
+
+
+class TestFieldContentProductionTechnique(TestCase):
+
+    def test_process_data_batch(self):
+        preprocessor = SplitCounter()
+        data_list = ["same title", "other title", "same title", ["already", "tokenized"]]
+
+        result = FieldContentProductionTechnique.process_data_batch(data_list, [preprocessor])
+
+        self.assertEqual([["same", "title"], ["other", "title"], ["same", "title"], ["already", "tokenized"]],
+                         result)
+
+        # identical str data is processed only once, but each content gets its own list
+        self.assertEqual(3, preprocessor.n_calls)
+        self.assertIsNot(result[0], result[2])
+
+        # no preprocessors means no processing
+        self.assertEqual(data_list, FieldContentProductionTechnique.process_data_batch(data_list, []))
+
+    def test_processed_data_iterator_lazy(self):
+        preprocessor = SplitCounter()
+        technique = OriginalData()
+        technique._processing_batch_size = 5
+
+        with technique.processed_data_iterator("Title", [preprocessor], JSONFile(file_path)) as pbar:
+            # nothing is processed before the progress bar is iterated
+            self.assertEqual(0, preprocessor.n_calls)
+            self.assertEqual(20, pbar.total)
+
+            first_processed = next(iter(pbar))
+
+            # only the first batch has been processed
+            self.assertEqual(5, preprocessor.n_calls)
+
+        expected = [content["Title"].split() for content in JSONFile(file_path)]
+        self.assertEqual(expected[0], first_processed)
+
+        with technique.processed_data_iterator("Title", [SplitCounter()], JSONFile(file_path)) as pbar:
+            self.assertEqual(expected, list(pbar))
+
+    def test_iter_expanded_data(self):
+        processed_iterator = iter([["same", "title"], ["other", "title"]])
+        data_positions = [0, 1, 0]
+
+        result = list(SingleContentTechnique._iter_expanded_data(processed_iterator, data_positions))
+
+        self.assertEqual([["same", "title"], ["other", "title"], ["same", "title"]], result)
+        # each content gets its own list
+        self.assertIsNot(result[0], result[2])
+
+
 class TestOriginalData(TestCase):
     @classmethod
     def setUpClass(cls) -> None:
@@ -25,6 +96,24 @@ class TestOriginalData(TestCase):
 
         self.assertEqual(len(data_list), 20)
         self.assertIsInstance(data_list[0], SimpleField)
+        self.assertEqual([content["Title"] for content in JSONFile(file_path)], [field.value for field in data_list])
+
+        # preprocessed data goes through the whole pipeline
+        data_list = technique.produce_content("Title", [SplitCounter()], [], JSONFile(file_path))
+
+        self.assertEqual(len(data_list), 20)
+        self.assertEqual([content["Title"] for content in JSONFile(file_path)], [field.value for field in data_list])
+
+    def test_produce_content_parallel(self):
+        serial_list = OriginalData().produce_content("Title", [SplitCounter()], [], JSONFile(file_path))
+
+        # data of the contents is processed by 2 worker processes, representations must keep the source order
+        technique = OriginalData(num_cpus=2)
+        parallel_list = technique.produce_content("Title", [SplitCounter()], [], JSONFile(file_path))
+
+        self.assertEqual(len(parallel_list), 20)
+        self.assertIsInstance(parallel_list[0], SimpleField)
+        self.assertEqual([field.value for field in serial_list], [field.value for field in parallel_list])
 
     def test_produce_content_dtype_specified(self):
         technique = OriginalData(dtype=int)
@@ -38,6 +127,17 @@ class TestOriginalData(TestCase):
         self.assertIsInstance(result[0], SimpleField)
         self.assertIsInstance(result[0].value, int)
 
+    def test_produce_content_dtype_duplicate_values(self):
+        technique = OriginalData(dtype=float)
+
+        with open(self.file_name, 'w') as f:
+            f.write("50.5\n50.5\n10")
+
+        result = technique.produce_content("0", [], [], DATFile(self.file_name))
+
+        self.assertEqual([50.5, 50.5, 10.0], [field.value for field in result])
+        self.assertTrue(all(isinstance(field.value, float) for field in result))
+
     def test_produce_content_dtype_cant_convert(self):
         technique = OriginalData(dtype=int)
 
@@ -1,3 +1,4 @@
+import ast
 from unittest import TestCase
 import os
 
@@ -29,3 +30,27 @@ class TestSkLearnTfIdf(TestCase):
 
         self.assertEqual(len(features_bag_list), 20)
         self.assertIsInstance(features_bag_list[0], FeaturesBagField)
+
+        # the features of each representation must be the non-zero columns of its sparse row
+        for features_bag in features_bag_list:
+            nonzero_pos = list(features_bag.value.nonzero()[1])
+            pos_feature_tuples = ast.literal_eval(features_bag.to_json()['pos_word_tuples'])
+
+            self.assertEqual(features_bag.value.shape[0], 1)
+            self.assertCountEqual(nonzero_pos, [pos for pos, _ in pos_feature_tuples])
+
+    def test_dataset_refactor(self):
+        technique = SkLearnTfIdf()
+
+        dataset_len = technique.dataset_refactor(JSONFile(file_path), "Title", [])
+
+        # rows are sliced when building the representations, so the matrix must be csr with sorted indices
+        self.assertEqual(dataset_len, 20)
+        self.assertEqual(technique._tfidf_matrix.format, 'csr')
+        self.assertTrue(technique._tfidf_matrix.has_sorted_indices)
+
+        # feature names are stored as an object array so that they can be retrieved with fancy indexing
+        self.assertEqual(technique._feature_names.dtype, object)
+        self.assertEqual(len(technique._feature_names), technique._tfidf_matrix.shape[1])
+
+        technique.delete_refactored()
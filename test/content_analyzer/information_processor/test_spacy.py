@@ -96,3 +96,12 @@ class TestSpacy(TestCase):
             "their.    feet;   for:  best  http://twitter.it")
 
         self.assertEqual(expected, result)
+
+    def test_process_batch(self):
+        spa = Spacy(stopwords_removal=True, remove_punctuation=True)
+        text_list = ["The striped bats are hanging on their feet for the best",
+                     "Hello there. How are you? I'm fine, thanks."]
+
+        expected = [spa.process(text) for text in text_list]
+        result = spa.process_batch(text_list)
+        self.assertEqual(expected, result)
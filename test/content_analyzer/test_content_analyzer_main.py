@@ -2,6 +2,7 @@ import os
 import shutil
 import unittest
 from unittest import TestCase
+from unittest.mock import patch
 import lzma
 import pickle
 import numpy as np
@@ -9,6 +10,7 @@ import scipy.sparse
 
 from clayrs.content_analyzer.exogenous_properties_retrieval import PropertiesFromDataset
 from clayrs.content_analyzer import ContentAnalyzer, FieldConfig, ExogenousConfig, ItemAnalyzerConfig
+from clayrs.content_analyzer.content_analyzer_main import ContentsProducer
 from clayrs.content_analyzer.content_representation.content import FeaturesBagField, \
     EmbeddingField, IndexField, PropertiesDict
 from clayrs.content_analyzer.field_content_production_techniques import OriginalData
@@ -50,6 +52,38 @@ class TestContentsProducer(TestCase):
                     self.assertIsInstance(content.get_exogenous_representation(0).value, dict)
                     break
 
+    def test_create_contents_reads_source_once(self):
+        movies_ca_config = ItemAnalyzerConfig(JSONFile(movies_info_reduced), ["imdbID"], "read_source_once_test")
+        movies_ca_config.add_single_exogenous(ExogenousConfig(PropertiesFromDataset(field_name_list=['Title'])))
+        movies_ca_config.add_single_config('Title', FieldConfig(OriginalData()))
+        movies_ca_config.add_single_config('Plot', FieldConfig(OriginalData()))
+
+        contents_producer = ContentsProducer.get_instance()
+        contents_producer.set_config(movies_ca_config)
+
+        with patch.object(JSONFile, '__iter__', autospec=True, side_effect=JSONFile.__iter__) as mocked_iter, \
+                patch.object(JSONFile, '__len__', autospec=True, side_effect=JSONFile.__len__) as mocked_len:
+            contents_list = contents_producer.create_contents()
+
+        self.assertEqual(20, len(contents_list))
+
+        # ids, exogenous properties and each field representation are all produced from a single read of the file
+        self.assertEqual(1, mocked_iter.call_count)
+        self.assertEqual(0, mocked_len.call_count)
+
+    def test_create_contents_source_iterated_once_not_cached(self):
+        movies_ca_config = ItemAnalyzerConfig(JSONFile(movies_info_reduced), ["imdbID"], "source_not_cached_test")
+
+        contents_producer = ContentsProducer.get_instance()
+        contents_producer.set_config(movies_ca_config)
+
+        # only ids are built, so the source is iterated once and there's no need to keep its rows in memory
+        with patch('clayrs.content_analyzer.content_analyzer_main.InMemorySource') as mocked_in_memory_source:
+            contents_list = contents_producer.create_contents()
+
+        self.assertEqual(20, len(contents_list))
+        mocked_in_memory_source.assert_not_called()
+
     def test_field_exceptions(self):
         # test to make sure that the method that checks the field configs ids for each field name in the field_dict
         # of the content analyzer works. It considers the three cases this can occur: when passing the field_dict
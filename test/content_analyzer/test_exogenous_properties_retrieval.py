@@ -2,6 +2,7 @@ import os
 from unittest import TestCase
 
 from clayrs.content_analyzer import JSONFile
+from clayrs.content_analyzer.raw_information_source import InMemorySource
 from clayrs.content_analyzer.exogenous_properties_retrieval import DBPediaMappingTechnique, PropertiesFromDataset, \
     BabelPyEntityLinking
 from test import dir_test_files
@@ -237,6 +238,16 @@ class TestPropertiesFromDataset(TestCase):
         self.assertEqual(prop1.value, expected_1)
         self.assertEqual(prop2.value, expected_2)
 
+    def test_get_properties_copies_rows(self):
+        # rows of an in memory source are the same dict objects at each iteration
+        raw_source = InMemorySource(JSONFile(source_path))
+
+        results = PropertiesFromDataset(mode='all').get_properties(raw_source)
+        results[0].value['Title'] = 'modified'
+
+        # properties don't share the rows of the source
+        self.assertEqual('Jumanji', next(iter(raw_source))['Title'])
+
 
 class TestBabelPyEntityLinking(TestCase):
     @classmethod
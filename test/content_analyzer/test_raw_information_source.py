@@ -1,7 +1,7 @@
 import os
 from unittest import TestCase
 
-from clayrs.content_analyzer.raw_information_source import SQLDatabase, CSVFile, JSONFile, DATFile
+from clayrs.content_analyzer.raw_information_source import CSVFile, JSONFile, DATFile, InMemorySource
 from test import dir_test_files
 
 json_file = os.path.join(dir_test_files, "movies_info_reduced.json")
@@ -11,20 +11,6 @@ dat_file = os.path.join(dir_test_files, 'users_70.dat')
 tsv_file = os.path.join(dir_test_files, 'random_tsv.tsv')
 
 
-class TestSQLDatabase(TestCase):
-
-    def test_iter(self):
-        self.skipTest("FIX TEST")
-        sql = SQLDatabase('localhost', 'root', 'password', 'prova', 'tabella')
-        my_iter = iter(sql)
-        d1 = {'campo1': 'Francesco', 'campo2': 'Benedetti', 'campo3': 'Polignano'}
-        d2 = {'campo1': 'Mario', 'campo2': 'Rossi', 'campo3': 'Roma'}
-        d3 = {'campo1': 'Gigio', 'campo2': 'Donnarumma', 'campo3': 'Milano'}
-        self.assertDictEqual(next(my_iter), d1)
-        self.assertDictEqual(next(my_iter), d2)
-        self.assertDictEqual(next(my_iter), d3)
-
-
 class TestCSVFile(TestCase):
 
     def test_iter(self):
@@ -221,3 +207,22 @@ class TestDATFile(TestCase):
 
         dat = DATFile(dat_file)
         self.assertEqual(70, len(dat))
+
+
+class TestInMemorySource(TestCase):
+    def test_iter(self):
+        json_source = JSONFile(json_file)
+        source = InMemorySource(json_source)
+
+        self.assertEqual(20, len(source))
+        self.assertEqual(json_source.file_path, source.file_path)
+        self.assertEqual(json_source.representative_name, source.representative_name)
+
+        # rows are read from the wrapped source only once and are then kept in memory
+        first_iteration = list(source)
+        second_iteration = list(source)
+
+        self.assertEqual(list(json_source), first_iteration)
+        self.assertEqual(len(first_iteration), len(source))
+        for first_row, second_row in zip(first_iteration, second_iteration):
+            self.assertIs(first_row, second_row)
@@ -0,0 +1,67 @@
+import functools
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from clayrs.content_analyzer.ratings_manager.ratings import Rank, Ratings, StrIntMap
+from test import dir_test_files
+
+
+# every group of ratings used by the evaluation tests (original, train, truth, recs, rank_wo_u3, truth_w_u3) is
+# stored in a single file, told apart by the 'fixture' column. recs don't contain u6, just to test DeltaGap in case
+# for some users recs can't be computed
+FIXTURES_PATH = os.path.join(dir_test_files, 'test_eval', 'metric_evaluator_fixtures.csv')
+
+
+def _ratings(user_ids: np.ndarray, item_ids: np.ndarray, scores: np.ndarray, ratings_cls: type = Ratings,
+             user_map: StrIntMap = None, item_map: StrIntMap = None) -> Ratings:
+    # columns are passed directly to the ratings object, there's no need to build a DataFrame just to
+    # extract its values again
+    return ratings_cls.from_list(zip(user_ids, item_ids, scores), user_map=user_map, item_map=item_map)
+
+
+@functools.lru_cache(maxsize=None)
+def fixtures_frame() -> pd.DataFrame:
+    # ids are read as categorical, so each distinct id is parsed and stored only once
+    return pd.read_csv(FIXTURES_PATH, dtype={'fixture': 'category', 'user_id': 'category', 'item_id': 'category',
+                                             'score': np.float32})
+
+
+@functools.lru_cache(maxsize=None)
+def build_ratings(fixture: str, ratings_cls: type = Ratings, map_fixture: str = None,
+                  items_to_append: tuple = ()) -> Ratings:
+    # fixtures are immutable, so each one is converted from its rows only once.
+    # If map_fixture is specified, user and item mappings are taken from the ratings built with that fixture
+    frame = fixtures_frame()
+    fixture_frame = frame[frame['fixture'] == fixture]
+    user_ids = fixture_frame['user_id'].to_numpy()
+    item_ids = fixture_frame['item_id'].to_numpy()
+    scores = fixture_frame['score'].to_numpy()
+
+    if map_fixture is not None:
+        map_ratings = build_ratings(map_fixture)
+        ratings = _ratings(user_ids, item_ids, scores, ratings_cls,
+                           user_map=map_ratings.user_map,
+                           item_map=map_ratings.item_map)
+    else:
+        ratings = _ratings(user_ids, item_ids, scores, ratings_cls)
+
+    if len(items_to_append) != 0:
+        ratings.item_map.append(list(items_to_append))
+
+    return ratings
+
+
+EvalFixtures = namedtuple('EvalFixtures', ['original', 'train', 'truth_list', 'rank_pred_list'])
+
+
+@functools.lru_cache(maxsize=None)
+def eval_fixtures() -> EvalFixtures:
+    # shared by every test module which imports it, fixtures are built only the first time they are requested
+    # in the whole test session
+    return EvalFixtures(original=build_ratings('original'),
+                        train=build_ratings('train', map_fixture='original'),
+                        truth_list=[build_ratings('truth', map_fixture='original')],
+                        rank_pred_list=[build_ratings('recs', ratings_cls=Rank, map_fixture='original')])
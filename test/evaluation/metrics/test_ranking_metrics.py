@@ -431,6 +431,26 @@ class TestMAPAtK(unittest.TestCase):
         expected_u1_ap = 1/2 * 1/2
         self.assertAlmostEqual(expected_u1_ap, result_u1_ap)
 
+    def test_perform_matches_compute_ap(self):
+        relevant_threshold = 3
+
+        for k in [1, 2, 3, 5, 10]:
+            metric = MAPAtK(k=k, relevant_threshold=relevant_threshold)
+            df_result = metric.perform(split_w_new_items)
+
+            for user in ['u1', 'u2']:
+                with self.subTest(k=k, user=user):
+                    user_pred = pred_w_new_items.get_user_interactions(pred_w_new_items.user_map[user])
+                    user_pred_items = pred_w_new_items.item_map[user_pred[:, 1].astype(int)]
+
+                    user_truth = truth.get_user_interactions(truth.user_map[user])
+                    user_truth_relevant = user_truth[np.where(user_truth[:, 2] >= relevant_threshold)]
+                    user_truth_relevant_items = truth.item_map[user_truth_relevant[:, 1].astype(int)]
+
+                    expected_ap = metric._compute_ap(user_pred_items, user_truth_relevant_items)
+                    result_ap = float(df_result.query('user_id == @user')['AP'])
+                    self.assertTrue(np.isclose(expected_ap, result_ap, rtol=0, atol=1e-12))
+
 
 class TestCorrelation(unittest.TestCase):
     @classmethod
@@ -1,10 +1,13 @@
 import unittest
 from collections import Counter
 from unittest import TestCase
+import numpy as np
 import pandas as pd
 
 from clayrs.content_analyzer import Ratings
-from clayrs.evaluation.utils import get_most_popular_items, pop_ratio_by_user, get_avg_pop, get_item_popularity
+from clayrs.evaluation.eval_pipeline_modules.metric_evaluator import Split
+from clayrs.evaluation.utils import get_most_popular_items, pop_ratio_by_user, get_avg_pop, get_item_popularity, \
+    get_relevant_hits
 
 
 class TestUtils(TestCase):
@@ -93,6 +96,28 @@ class TestUtils(TestCase):
         expected_u5 = (counter_popularity['i2'] + counter_popularity['i70']) / 2
         self.assertAlmostEqual(expected_u5, result_u5)
 
+    def test_get_relevant_hits(self):
+        truth = Ratings.from_list([('u1', 'i1', 5), ('u1', 'i2', 2.5), ('u1', 'i3', 4),
+                                   ('u2', 'i1', 3), ('u2', 'i4', 4)])
+
+        # predictions of u2 come first and use a different item mapping, i3 is recommended twice to u1
+        pred = Ratings.from_list([('u2', 'i4', 5), ('u2', 'i1', 4),
+                                  ('u1', 'i3', 5), ('u1', 'i9', 4), ('u1', 'i3', 3), ('u1', 'i1', 2)])
+
+        # mean score of each user is used as threshold: relevant items are i1, i3 for u1 and i4 for u2
+        user_idxs, offsets, hits, n_relevant = get_relevant_hits(Split(pred, truth))
+
+        np.testing.assert_array_equal(truth.user_map[['u1', 'u2']], user_idxs)
+        np.testing.assert_array_equal([0, 4, 6], offsets)
+        np.testing.assert_array_equal([True, False, False, True, True, False], hits)
+        np.testing.assert_array_equal([2, 1], n_relevant)
+
+        # i1 is relevant for u2 too with a fixed threshold
+        user_idxs, offsets, hits, n_relevant = get_relevant_hits(Split(pred, truth), relevant_threshold=3)
+
+        np.testing.assert_array_equal([True, False, False, True, True, True], hits)
+        np.testing.assert_array_equal([2, 2], n_relevant)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -10,7 +10,9 @@ from clayrs.recsys.content_based_algorithm.regressor.regressors import SkLinearR
     SkSGDRegressor, SkARDRegression, SkHuberRegressor, SkPassiveAggressiveRegressor, SkBayesianRidge, SkRidge, \
     Regressor
 import os
+import numpy as np
 import pandas as pd
+from scipy import sparse
 
 from test import dir_test_files
 
@@ -142,6 +144,26 @@ class TestRegression(TestCase):
         res_n_recs = alg.rank_single_user(user_idx, self.ratings, self.available_loaded_items, n_recs, self.filter_list)
         self.assertEqual(len(res_n_recs), n_recs)
 
+    def test_huber_warm_start(self):
+        # warm start is opt-in, as in sklearn
+        self.assertFalse(SkHuberRegressor().model.warm_start)
+
+        model = SkHuberRegressor(warm_start=True)
+        self.assertTrue(model.model.warm_start)
+
+        X = sparse.random(20, 10, density=0.3, format='csr', random_state=42)
+        Y = np.arange(20, dtype=float)
+        model.fit(X, Y)
+        cold_n_iter = model.model.n_iter_
+
+        # fitting again on the same data starts from the already optimal coefficients
+        model.fit(X, Y)
+        self.assertLessEqual(model.model.n_iter_, cold_n_iter)
+
+        # data with a different number of features can still be fit
+        model.fit(X[:, :5], Y)
+        self.assertEqual(model.model.coef_.shape[0], 5)
+
     def test_raise_errors(self):
         # No Item available locally
         ratings = pd.DataFrame.from_records([
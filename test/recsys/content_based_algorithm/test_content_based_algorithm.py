@@ -132,6 +132,32 @@ class TestContentBasedAlgorithm(TestCase):
         self.assertTrue(np.allclose(result[0], expected_1))
         self.assertTrue(np.allclose(result[1], expected_2))
 
+    def test_fuse_representations_sparse(self):
+        tfidf_result1 = sparse.csc_matrix(np.array([[0, 1.546, 0, 0.55]]))
+        doc_embedding_result1 = np.array([[0.98347, 1.384038]])
+        float_result1 = 8.8
+
+        tfidf_result2 = sparse.csc_matrix(np.array([[1.1, 0, 0, 0]]))
+        doc_embedding_result2 = np.array([[2.331, 0.887]])
+        int_result2 = 7
+
+        x = [[tfidf_result1, doc_embedding_result1, float_result1],
+             [tfidf_result2, doc_embedding_result2, int_result2]]
+
+        result = self.alg.fuse_representations(x, Centroid())
+
+        expected = np.array([np.hstack([tfidf_result1.toarray().flatten(), doc_embedding_result1.flatten(),
+                                        float_result1]),
+                             np.hstack([tfidf_result2.toarray().flatten(), doc_embedding_result2.flatten(),
+                                        int_result2])])
+
+        self.assertIsInstance(result, sparse.csr_matrix)
+        self.assertTrue(np.allclose(result.toarray(), expected))
+
+        result_array = self.alg.fuse_representations(x, Centroid(), as_array=True)
+        self.assertIsInstance(result_array, np.ndarray)
+        self.assertTrue(np.allclose(result_array, expected))
+
     def test__load_available_contents(self):
         # test load_available_contents for content based algorithm
         movies_dir = os.path.join(dir_test_files, 'complex_contents', 'movies_codified/')